@@ -0,0 +1,209 @@
+# bench/check_espn_client.py
+"""
+Checks espn_client's box-score rows against espn_api's BoxScore/BoxPlayer:
+both read the same mMatchupScore payload from a local stub server, and the
+rows espn_client builds must equal bot._normalize_box_scores of espn_api's
+objects (team scores, player points and positions, bye sides).
+
+    python -m bench.check_espn_client
+"""
+import asyncio
+import json
+import sys
+from types import SimpleNamespace
+
+from aiohttp import web
+
+from bench.run import _prepare_env
+
+LEAGUE_ID = 4242
+SEASON = 2024
+WEEK = 5
+MATCHUP_PERIOD = 5
+TEAMS = {1: "Gridiron Ghosts", 2: "Fourth & Long", 3: "Waiver Wire Warriors", 4: "Bye Bye Birdie"}
+
+
+def _stats(week: int, actual: float | None, projected: float | None = None) -> list[dict]:
+    out = []
+    if actual is not None:
+        out.append({"seasonId": SEASON, "scoringPeriodId": week, "statSourceId": 0,
+                    "statSplitTypeId": 1, "appliedTotal": actual, "stats": {"3": 1.0}})
+    if projected is not None:
+        out.append({"seasonId": SEASON, "scoringPeriodId": week, "statSourceId": 1,
+                    "statSplitTypeId": 1, "appliedTotal": projected, "stats": {"3": 1.0}})
+    return out
+
+
+def _entry(player_id: int, name: str, slots: list[int], lineup_slot: int, pro_team: int,
+           default_pos: int, stats: list[dict]) -> dict:
+    return {
+        "playerId": player_id,
+        "lineupSlotId": lineup_slot,
+        "playerPoolEntry": {"player": {
+            "id": player_id, "fullName": name, "eligibleSlots": slots, "proTeamId": pro_team,
+            "defaultPositionId": default_pos, "stats": stats,
+        }},
+    }
+
+
+def _payload() -> dict:
+    """A week with a regular matchup, a bye, and a matchup from another period the filter must drop."""
+    home = [
+        # Starter QB with actual and projected points for the week, plus last week's score
+        _entry(101, "Arm Strong", [0, 7, 20, 21], 0, 2, 1,
+               _stats(WEEK, 23.456, 18.2) + _stats(WEEK - 1, 11.0)),
+        # Flex RB: combo slot 23 and rookie slot 25 come first and must be skipped for position
+        _entry(102, "Rush Hour", [25, 23, 2, 3], 23, 2, 2, _stats(WEEK, 8.1)),
+        # Bench WR with only a projection this week (hasn't played)
+        _entry(103, "Deep Threat", [23, 3, 4, 5], 20, 9, 3, _stats(WEEK, None, 12.7)),
+        # D/ST: a "/" in the name keeps the combo position
+        _entry(104, "Bears D/ST", [16], 16, 3, 16, _stats(WEEK, -2.0)),
+        # Season totals (scoringPeriodId 0) and split type 2 must not count as the week's points
+        _entry(105, "Old Reliable", [4, 5], 20, 9, 4,
+               _stats(0, 88.0) + [{"seasonId": SEASON, "scoringPeriodId": WEEK, "statSourceId": 0,
+                                   "statSplitTypeId": 2, "appliedTotal": 99.0, "stats": {}}]),
+        # Last season's row for the same week must be ignored
+        _entry(106, "Retread", [2, 3], 20, 2, 2,
+               [{"seasonId": SEASON - 1, "scoringPeriodId": WEEK, "statSourceId": 0,
+                 "statSplitTypeId": 1, "appliedTotal": 30.0, "stats": {"3": 1.0}}]),
+    ]
+    away = [
+        _entry(201, "Kick Six", [17], 17, 3, 5, _stats(WEEK, 9.0, 8.0)),
+        _entry(202, "No Stats At All", [2, 3], 20, 2, 2, []),
+    ]
+    bye = [_entry(301, "Lonely Back", [2], 2, 9, 2, _stats(WEEK, 14.55))]
+    return {
+        "id": LEAGUE_ID,
+        "seasonId": SEASON,
+        "scoringPeriodId": WEEK,
+        "schedule": [
+            {"id": 1, "matchupPeriodId": MATCHUP_PERIOD,
+             "home": {"teamId": 1, "totalPoints": 31.44, "totalPointsLive": 29.456,
+                      "rosterForCurrentScoringPeriod": {"entries": home}},
+             "away": {"teamId": 2, "totalPoints": 17.0,
+                      "rosterForCurrentScoringPeriod": {"entries": away}}},
+            {"id": 2, "matchupPeriodId": MATCHUP_PERIOD,
+             "home": {"teamId": 3, "totalPoints": 14.55,
+                      "rosterForCurrentScoringPeriod": {"entries": bye}}},
+            {"id": 3, "matchupPeriodId": MATCHUP_PERIOD + 1,
+             "home": {"teamId": 4, "totalPoints": 0}, "away": {"teamId": 1, "totalPoints": 0}},
+        ],
+    }
+
+
+def _pro_schedule() -> dict:
+    # Pro team 2 plays 3 this week; 9 is on its NFL bye
+    game = {"homeProTeamId": 2, "awayProTeamId": 3, "date": 1_728_000_000_000}
+    return {"settings": {"proTeams": [
+        {"id": 2, "proGamesByScoringPeriod": {str(WEEK): [game]}},
+        {"id": 3, "proGamesByScoringPeriod": {str(WEEK): [game]}},
+        {"id": 9, "proGamesByScoringPeriod": {}},
+    ]}}
+
+
+def _stub_app(requests: list[dict]) -> web.Application:
+    payload = _payload()
+
+    async def league(request: web.Request) -> web.Response:
+        views = request.query.getall("view", [])
+        fantasy_filter = json.loads(request.headers.get("x-fantasy-filter", "{}"))
+        # espn_api sends the periods as strings (its matchup_periods keys); ESPN takes either
+        periods = fantasy_filter.get("schedule", {}).get("filterMatchupPeriodIds", {}).get("value")
+        periods = [int(p) for p in periods] if periods else None
+        requests.append({"views": views, "scoringPeriodId": request.query.get("scoringPeriodId"),
+                         "periods": periods})
+        if "mPositionalRatings" in views:
+            return web.json_response({"positionAgainstOpponent": {"positionalRatings": {
+                "2": {"ratingsByOpponent": {"3": {"rank": 7}, "2": {"rank": 20}}},
+            }}})
+        # Like ESPN, only return the matchup periods the filter asks for
+        data = dict(payload)
+        if periods:
+            data["schedule"] = [m for m in payload["schedule"] if m["matchupPeriodId"] in periods]
+        return web.json_response(data)
+
+    async def season(request: web.Request) -> web.Response:
+        return web.json_response(_pro_schedule())
+
+    app = web.Application()
+    app.router.add_get(f"/ffl/seasons/{SEASON}/segments/0/leagues/{LEAGUE_ID}", league)
+    app.router.add_get(f"/ffl/seasons/{SEASON}", season)
+    return app
+
+
+def _espn_api_league(base: str):
+    from espn_api.football import League
+
+    league = League(LEAGUE_ID, SEASON, fetch_league=False)
+    league.espn_request.ENDPOINT = f"{base}/ffl/seasons/{SEASON}"
+    league.espn_request.LEAGUE_ENDPOINT = f"{base}/ffl/seasons/{SEASON}/segments/0/leagues/{LEAGUE_ID}"
+    league.current_week = WEEK + 1
+    league.currentMatchupPeriod = MATCHUP_PERIOD + 1
+    league.settings = SimpleNamespace(matchup_periods={str(p): [p] for p in range(1, 15)})
+    league.teams = [SimpleNamespace(team_id=tid, team_name=name) for tid, name in TEAMS.items()]
+    return league
+
+
+def _diff(label: str, expected: list[tuple], actual: list[tuple]) -> list[str]:
+    problems = []
+    if len(expected) != len(actual):
+        problems.append(f"{label}: {len(actual)} rows, espn_api has {len(expected)}")
+    for want, got in zip(expected, actual):
+        if want != got:
+            problems.append(f"{label}: espn_client {got!r} != espn_api {want!r}")
+    return problems
+
+
+async def check() -> list[str]:
+    import bot
+    from espn_client import EspnClient
+
+    requests: list[dict] = []
+    runner = web.AppRunner(_stub_app(requests))
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    base = f"http://127.0.0.1:{port}"
+
+    client = EspnClient(base_url=f"{base}/ffl")
+    try:
+        games, players = await client.fetch_box_score_rows(
+            LEAGUE_ID, SEASON, WEEK, MATCHUP_PERIOD, team_names=TEAMS, swid="{SWID}", espn_s2="s2"
+        )
+        client_request = requests[-1]
+        league = _espn_api_league(base)
+        boxes = await asyncio.to_thread(league.box_scores, WEEK)
+    finally:
+        await client.close()
+        await runner.cleanup()
+
+    expected_games, expected_players = bot._normalize_box_scores(boxes)
+    problems = _diff("games", expected_games, games) + _diff("players", expected_players, players)
+
+    api_request = next(r for r in requests if "mMatchupScore" in r["views"] and r is not client_request)
+    for field in ("views", "scoringPeriodId", "periods"):
+        if client_request[field] != api_request[field]:
+            problems.append(f"request {field}: espn_client {client_request[field]!r} != espn_api {api_request[field]!r}")
+
+    # Guard against a payload that stopped exercising the cases this check is for
+    if not any(g[4] == 0 and g[5] is None for g in games):
+        problems.append("payload has no bye matchup")
+    if len(games) != 2:
+        problems.append(f"expected the matchup-period filter to leave 2 games, got {len(games)}")
+    return problems
+
+
+def main() -> int:
+    _prepare_env()
+    problems = asyncio.run(check())
+    if problems:
+        for p in problems:
+            print(f"❌ {p}")
+        return 1
+    print("✅ espn_client box-score rows match espn_api's BoxScore/BoxPlayer")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
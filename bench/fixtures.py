@@ -0,0 +1,157 @@
+# bench/fixtures.py
+import json
+import random
+import time
+
+# Starting lineup plus bench, as (position, slot)
+ROSTER = [
+    ("QB", "QB"), ("RB", "RB"), ("RB", "RB"), ("WR", "WR"), ("WR", "WR"), ("TE", "TE"),
+    ("WR", "RB/WR/TE"), ("D/ST", "D/ST"), ("K", "K"),
+    ("QB", "BE"), ("RB", "BE"), ("RB", "BE"), ("WR", "BE"), ("WR", "BE"), ("TE", "BE"), ("K", "BE"),
+]
+DST_NAMES = ["Bears", "Bills", "Browns", "Chiefs", "Cowboys", "Eagles", "Giants", "Jets", "Lions", "Packers",
+             "Ravens", "Saints", "Steelers", "Texans", "Titans", "Vikings", "Rams", "Colts", "Jaguars", "Dolphins"]
+
+
+class FixtureTeam:
+    def __init__(self, team_id: int, team_name: str, wins=0, losses=0, points_for=0.0, points_against=0.0):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.wins = wins
+        self.losses = losses
+        self.points_for = points_for
+        self.points_against = points_against
+
+
+class FixtureLeague:
+    """
+    Offline stand-in for espn_api's League. box_scores() replays stored
+    (games, players) rows, in settings_manager's layout, after sleeping for
+    the injected latency (it runs in espn_call's worker thread, like the real one).
+    """
+    def __init__(self, league_id: int, season: int, current_week: int, teams: list[dict],
+                 weeks: dict[int, tuple[list, list]], latency: float = 0.0):
+        self.league_id = league_id
+        self.year = season
+        self.current_week = current_week
+        self.nfl_week = current_week
+        self.teams = [FixtureTeam(**t) for t in teams]
+        self.weeks = weeks
+        self.latency = latency
+        self.box_score_calls = 0
+
+    def box_scores(self, week: int | None = None):
+        from bot import _rehydrate_box_scores  # bot reads env at import; the runner sets it up first
+        self.box_score_calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        games, players = self.weeks.get(int(week or self.current_week), ([], []))
+        return _rehydrate_box_scores(self, games, players)
+
+    def refresh(self):
+        if self.latency:
+            time.sleep(self.latency)
+
+
+def synthetic_fixture(teams: int, weeks: int, seed: int = 0, precision: int = 2) -> dict:
+    """Deterministic league with `teams` teams and `weeks` weeks of box scores."""
+    rnd = random.Random(f"{seed}:{teams}:{weeks}")
+    team_rows = [
+        {"team_id": i, "team_name": f"Team {i}", "wins": 0, "losses": 0, "points_for": 0.0, "points_against": 0.0}
+        for i in range(1, teams + 1)
+    ]
+    # Fixed rosters, so season totals accumulate per player like a real league
+    rosters = {}
+    for t in team_rows:
+        tid = t["team_id"]
+        rosters[tid] = [
+            (tid * 100 + j,
+             f"{DST_NAMES[(tid - 1) % len(DST_NAMES)]} D/ST" if pos == "D/ST" else f"{pos} {tid}-{j}",
+             pos, slot)
+            for j, (pos, slot) in enumerate(ROSTER)
+        ]
+
+    by_id = {t["team_id"]: t for t in team_rows}
+    week_rows = {}
+    for wk in range(1, weeks + 1):
+        order = [t["team_id"] for t in team_rows]
+        rnd.shuffle(order)
+        games, players = [], []
+        for i in range(0, len(order) - 1, 2):
+            game_index = i // 2
+            scores = {}
+            for side, tid in (("home", order[i]), ("away", order[i + 1])):
+                total = 0.0
+                for player_id, name, pos, slot in rosters[tid]:
+                    points = round(rnd.uniform(-2, 35), precision)
+                    if slot != "BE":
+                        total += points
+                    players.append((game_index, side, tid, player_id, name, pos, slot, points))
+                scores[side] = round(total, precision)
+            games.append((game_index, order[i], f"Team {order[i]}", scores["home"],
+                          order[i + 1], f"Team {order[i + 1]}", scores["away"]))
+            home, away = by_id[order[i]], by_id[order[i + 1]]
+            winner, loser = (home, away) if scores["home"] >= scores["away"] else (away, home)
+            winner["wins"] += 1
+            loser["losses"] += 1
+            home["points_for"] = round(home["points_for"] + scores["home"], precision)
+            home["points_against"] = round(home["points_against"] + scores["away"], precision)
+            away["points_for"] = round(away["points_for"] + scores["away"], precision)
+            away["points_against"] = round(away["points_against"] + scores["home"], precision)
+        week_rows[str(wk)] = {"games": games, "players": players}
+
+    return {
+        "league_id": 900000 + teams * 100 + weeks,
+        "season": 2025,
+        "current_week": weeks,
+        "teams": team_rows,
+        "weeks": week_rows,
+    }
+
+
+def load_fixture(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(fixture: dict, path: str) -> None:
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(fixture, f)
+
+
+def league_from_fixture(fixture: dict, latency: float = 0.0, league_id: int | None = None) -> FixtureLeague:
+    weeks = {
+        int(wk): ([tuple(g) for g in rows["games"]], [tuple(p) for p in rows["players"]])
+        for wk, rows in fixture["weeks"].items()
+    }
+    return FixtureLeague(
+        league_id or fixture["league_id"], fixture["season"], fixture["current_week"],
+        fixture["teams"], weeks, latency,
+    )
+
+
+def record_fixture(league, weeks=None) -> dict:
+    """Snapshot a live espn_api League (blocking) into a fixture for offline replay."""
+    from bot import _current_week, _normalize_box_scores
+    current_week = _current_week(league)
+    week_rows = {}
+    for wk in weeks or range(1, current_week + 1):
+        games, players = _normalize_box_scores(league.box_scores(week=wk))
+        week_rows[str(wk)] = {"games": games, "players": players}
+    return {
+        "league_id": int(league.league_id),
+        "season": int(league.year),
+        "current_week": current_week,
+        "teams": [
+            {
+                "team_id": t.team_id,
+                "team_name": t.team_name,
+                "wins": getattr(t, "wins", 0),
+                "losses": getattr(t, "losses", 0),
+                "points_for": getattr(t, "points_for", 0.0),
+                "points_against": getattr(t, "points_against", 0.0),
+            }
+            for t in league.teams
+        ],
+        "weeks": week_rows,
+    }
@@ -0,0 +1,215 @@
+# bench/run.py
+"""
+Offline recap benchmark: builds every week page for synthetic or recorded
+leagues, the way /weeklyrecap does, and writes a JSON report.
+
+    python -m bench.run                                   # 8/12/20 teams x 1/6/12/18 weeks
+    python -m bench.run --teams 12 --weeks 18 --latency-ms 150 --repeat 5
+    python -m bench.run --fixture my_league.json --baseline bench_report.old.json
+    python -m bench.run --record --league-id 123 --season 2025 --swid ... --espn-s2 ... --out my_league.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+from bench.fixtures import league_from_fixture, load_fixture, record_fixture, save_fixture, synthetic_fixture
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def _prepare_env():
+    # bot and settings_manager read these at import time
+    os.environ["SETTINGS_DB_PATH"] = os.path.join(tempfile.mkdtemp(prefix="recap-bench-"), "bench.db")
+    os.environ["METRICS_ENABLED"] = "0"
+    os.environ.setdefault("ESPN_RATE_PER_SECOND", "0")  # time the builders, not the request-rate cap
+    os.environ.setdefault("STAT_CORRECTION_SECONDS", "0")  # fixture weeks are settled; cache them like old weeks
+
+
+def _stage_seconds(before: dict, after: dict) -> dict[str, float]:
+    return {
+        key[0]: round(total - before.get(key, (0.0, 0))[0], 6)
+        for key, (total, _) in after.items()
+    }
+
+
+async def _build_recap(bot, metrics, league, weeks: int, label: str, trace_memory: bool) -> dict:
+    """One full recap build (all weeks through `weeks`), measured."""
+    stages_before = metrics.BUILD_SECONDS.totals()
+    calls_before = league.box_score_calls
+    if trace_memory:
+        tracemalloc.start()
+
+    started = time.perf_counter()
+    with bot.recap_scope(label, kind="bench") as cache:
+        pages = await bot.build_week_pages(league, range(1, weeks + 1))
+    seconds = time.perf_counter() - started
+
+    peak_kib = None
+    if trace_memory:
+        peak_kib = round(tracemalloc.get_traced_memory()[1] / 1024, 1)
+        tracemalloc.stop()
+    return {
+        "seconds": round(seconds, 6),
+        "espn_calls": cache.espn_calls,
+        "box_score_calls": league.box_score_calls - calls_before,
+        "peak_kib": peak_kib,
+        "pages": len(pages),
+        "embeds": sum(len(p) for p in pages.values()),
+        "stages": _stage_seconds(stages_before, metrics.BUILD_SECONDS.totals()),
+    }
+
+
+async def run_benchmarks(args) -> dict:
+    import bot
+    import metrics
+
+    if args.fixture:
+        sources = [(os.path.basename(path), load_fixture(path)) for path in args.fixture]
+    else:
+        sources = [
+            (f"synthetic-{teams}t-{weeks}w", synthetic_fixture(teams, weeks, seed=args.seed))
+            for teams in args.teams for weeks in args.weeks
+        ]
+
+    runs = []
+    await bot.init_db()
+    try:
+        for name, fixture in sources:
+            weeks = fixture["current_week"]
+            # tracemalloc slows allocation-heavy code several-fold, so the last
+            # repetition only measures peak memory and isn't timed
+            for rep in range(args.repeat + 1):
+                trace_memory = rep == args.repeat
+                # A fresh league id keeps every repetition cold: no SQLite rows, no in-memory prefixes
+                league_id = fixture["league_id"] + rep * 10_000_000
+                league = league_from_fixture(fixture, latency=args.latency_ms / 1000, league_id=league_id)
+                for phase in ("cold", "warm"):
+                    result = await _build_recap(
+                        bot, metrics, league, weeks, f"Bench {name} ({phase})", trace_memory
+                    )
+                    runs.append({
+                        "source": name,
+                        "teams": len(fixture["teams"]),
+                        "weeks": weeks,
+                        "phase": phase,
+                        "repeat": rep,
+                        "memory_only": trace_memory,
+                        **result,
+                    })
+    finally:
+        await bot.close_db()
+
+    return {
+        "bot_version": bot.BOT_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "config": {
+            "latency_ms": args.latency_ms,
+            "repeat": args.repeat,
+            "seed": args.seed,
+            "espn_max_concurrency": bot.ESPN_MAX_CONCURRENCY,
+            "espn_rate_per_second": bot.ESPN_RATE_PER_SECOND,
+            "recap_fanout": bot.RECAP_FANOUT,
+        },
+        "summary": _summarize(runs),
+        "runs": runs,
+    }
+
+
+def _summarize(runs: list[dict]) -> list[dict]:
+    groups: dict[tuple, list[dict]] = {}
+    for run in runs:
+        groups.setdefault((run["source"], run["teams"], run["weeks"], run["phase"]), []).append(run)
+    return [
+        {
+            "source": source,
+            "teams": teams,
+            "weeks": weeks,
+            "phase": phase,
+            "median_seconds": round(statistics.median(r["seconds"] for r in group if not r["memory_only"]), 6),
+            "max_seconds": max(r["seconds"] for r in group if not r["memory_only"]),
+            "espn_calls": max(r["espn_calls"] for r in group),
+            "peak_kib": max(r["peak_kib"] for r in group if r["memory_only"]),
+        }
+        for (source, teams, weeks, phase), group in groups.items()
+    ]
+
+
+def _print_summary(report: dict, baseline: dict | None):
+    previous = {}
+    if baseline:
+        previous = {(r["source"], r["phase"]): r for r in baseline.get("summary", [])}
+
+    def delta(new, old):
+        if old in (None, 0):
+            return ""
+        return f" ({(new - old) / old:+.0%})"
+
+    print(f"{'source':<26}{'phase':<7}{'median s':>14}{'ESPN calls':>16}{'peak KiB':>18}")
+    for row in report["summary"]:
+        old = previous.get((row["source"], row["phase"]), {})
+        print(
+            f"{row['source']:<26}{row['phase']:<7}"
+            f"{row['median_seconds']:>8.3f}{delta(row['median_seconds'], old.get('median_seconds')):>6}"
+            f"{row['espn_calls']:>10}{delta(row['espn_calls'], old.get('espn_calls')):>6}"
+            f"{row['peak_kib']:>12.1f}{delta(row['peak_kib'], old.get('peak_kib')):>6}"
+        )
+
+
+def _record(args):
+    from espn_api.football import League
+    league = League(league_id=args.league_id, year=args.season, espn_s2=args.espn_s2, swid=args.swid)
+    save_fixture(record_fixture(league), args.out)
+    print(f"💾 Recorded league {args.league_id} ({args.season}) to {args.out}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--teams", type=_int_list, default=[8, 12, 20], help="comma-separated team counts")
+    parser.add_argument("--weeks", type=_int_list, default=[1, 6, 12, 18], help="comma-separated season lengths")
+    parser.add_argument("--fixture", action="append", help="recorded fixture JSON (repeatable); replaces synthetic leagues")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="injected latency per ESPN call")
+    parser.add_argument("--repeat", type=int, default=3, help="timed repetitions (plus one memory pass)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", default="bench_report.json")
+    parser.add_argument("--baseline", help="earlier report to compare against")
+    parser.add_argument("--record", action="store_true", help="record a live league to --out instead of benchmarking")
+    parser.add_argument("--league-id", type=int)
+    parser.add_argument("--season", type=int)
+    parser.add_argument("--swid")
+    parser.add_argument("--espn-s2")
+    args = parser.parse_args(argv)
+
+    if args.repeat < 1:
+        parser.error("--repeat must be at least 1")
+    _prepare_env()
+    if args.record:
+        if not args.league_id or not args.season:
+            parser.error("--record needs --league-id and --season")
+        _record(args)
+        return 0
+
+    report = asyncio.run(run_benchmarks(args))
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)
+    _print_summary(report, baseline)
+    print(f"📝 Report written to {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,8 +4,20 @@ import os
 import asyncio
 import discord
 import aiohttp
+import numpy as np
 import urllib.parse
-from collections import defaultdict
+import contextvars
+import copy
+import hashlib
+import itertools
+import json
+import math
+import socket
+import time
+from datetime import datetime, timedelta, time as dtime
+from collections import defaultdict, OrderedDict
+from contextlib import contextmanager
+from functools import partial
 from discord import Webhook
 from discord.ext import commands
 from discord.ui import Button, View, Select
@@ -17,17 +29,95 @@ from dotenv import load_dotenv
 load_dotenv()
 
 from espn_api.football import League
+from espn_client import EspnClient
+from espn_limiter import AdaptiveLimiter, is_throttle_error
+from discord_outbox import Outbox
+from metrics import (
+    ESPN_CALL_SECONDS,
+    ESPN_CALLS_PER_RECAP,
+    ESPN_CONCURRENCY_LIMIT,
+    ESPN_WAITING,
+    BUILD_SECONDS,
+    DISCORD_SEND_SECONDS,
+    DISCORD_OUTBOX_DEPTH,
+    QUEUE_DEPTH,
+    QUEUE_WAIT_SECONDS,
+    JOB_SECONDS,
+    GUILD_JOB_SECONDS,
+    GUILD_JOBS,
+    CACHE_LOOKUPS,
+    CACHE_HIT_RATIO,
+    hit_ratio,
+    start_metrics_server,
+    stop_metrics_server
+)
+from recap_queue import RecapScheduler, JOB_PRIORITY, PRIORITY_INTERACTIVE, PRIORITY_SCHEDULED, PRIORITY_NAMES
 from settings_manager import (
     get_guild_settings,
     set_guild_settings,
     set_autopost,
+    set_live_scoring,
+    set_live_message,
     get_discord_bot_token,
-    init_db
+    init_db,
+    close_db,
+    load_all_guild_settings,
+    get_settings_cache_stats,
+    get_autopost_guild_settings,
+    list_guild_settings,
+    save_recap_artifacts,
+    get_recap_artifacts,
+    save_box_score_week,
+    get_box_score_week,
+    get_box_score_closed_at,
+    get_final_box_score_weeks,
+    save_navigator,
+    get_navigator,
+    save_league_precision,
+    get_league_precision,
+    enqueue_recap_job,
+    claim_recap_job,
+    renew_recap_job,
+    finish_recap_job,
+    fail_recap_job,
+    get_finished_recap_jobs,
+    close_recap_job,
+    recap_job_position,
+    count_recap_jobs,
+    prune_recap_jobs,
+    prune_navigators
 )
 
 # ---------- Discord setup ----------
+# Sharding is off unless SHARD_COUNT is set. SHARD_COUNT=auto takes Discord's
+# recommended count and runs every shard here; SHARD_COUNT=N with SHARD_IDS
+# (e.g. "0-3,8") runs only those shards, so launcher.py can split them across processes.
+def _parse_shard_ids(value: str) -> list[int] | None:
+    ids = []
+    for part in filter(None, (p.strip() for p in value.split(","))):
+        first, _, last = part.partition("-")
+        ids.extend(range(int(first), int(last or first) + 1))
+    return sorted(set(ids)) or None
+
+SHARD_COUNT = os.getenv("SHARD_COUNT", "").strip().lower()
+SHARD_IDS = _parse_shard_ids(os.getenv("SHARD_IDS", ""))
+
 intents = discord.Intents.default()  # Slash-command bot doesn't need message_content
-bot = commands.Bot(command_prefix="!", intents=intents)
+if SHARD_COUNT:
+    bot = commands.AutoShardedBot(
+        command_prefix="!", intents=intents,
+        shard_count=None if SHARD_COUNT == "auto" else int(SHARD_COUNT),
+        shard_ids=SHARD_IDS,
+    )
+else:
+    bot = commands.Bot(command_prefix="!", intents=intents)
+
+def owns_guild(guild_id: int) -> bool:
+    """Whether this process runs the shard Discord routes guild_id's events to."""
+    shard_count, shard_ids = bot.shard_count, getattr(bot, "shard_ids", None)
+    if not shard_count or shard_ids is None:
+        return True
+    return (int(guild_id) >> 22) % shard_count in shard_ids
 
 # Scheduler in ET (DST-aware): Tuesdays @ 11:00 AM
 scheduler = AsyncIOScheduler(timezone=ZoneInfo("America/New_York"))
@@ -37,32 +127,437 @@ HOME_BUGS_WEBHOOK_URL = os.getenv("HOME_BUGS_WEBHOOK_URL", "")
 HOME_FEEDBACK_WEBHOOK_URL = os.getenv("HOME_FEEDBACK_WEBHOOK_URL", "")
 OWNER_ID = int(os.getenv("OWNER_ID", "0"))
 
-# ---------- Global ESPN concurrency gate ----------
-ESPN_MAX_CONCURRENCY = int(os.getenv("ESPN_MAX_CONCURRENCY", "1"))       # how many ESPN calls at once
+# ---------- Global ESPN rate/concurrency limiter ----------
+ESPN_MAX_CONCURRENCY = int(os.getenv("ESPN_MAX_CONCURRENCY", "1"))       # starting number of ESPN calls at once
+ESPN_CONCURRENCY_CEILING = int(os.getenv("ESPN_CONCURRENCY_CEILING", "8"))  # adaptive limit never grows past this
 ESPN_TIMEOUT_SECONDS = int(os.getenv("ESPN_TIMEOUT_SECONDS", "25"))       # per-call timeout
-_ESPN_GATE = asyncio.Semaphore(ESPN_MAX_CONCURRENCY)
+ESPN_RATE_PER_SECOND = float(os.getenv("ESPN_RATE_PER_SECOND", "5"))      # token bucket refill (0 = off)
+ESPN_BURST = int(os.getenv("ESPN_BURST", "10"))                           # token bucket size
+ESPN_LATENCY_TARGET_SECONDS = float(os.getenv("ESPN_LATENCY_TARGET_SECONDS", "3"))  # slower calls stop the limit growing
+ESPN_MAX_RETRIES = int(os.getenv("ESPN_MAX_RETRIES", "3"))                # retries on 429/5xx/timeouts
+# Interactive recaps get ESPN slots before scheduled work
+_ESPN_LIMITER = AdaptiveLimiter(
+    initial=ESPN_MAX_CONCURRENCY,
+    ceiling=ESPN_CONCURRENCY_CEILING,
+    rate=ESPN_RATE_PER_SECOND,
+    burst=ESPN_BURST,
+    latency_target=ESPN_LATENCY_TARGET_SECONDS,
+    max_retries=ESPN_MAX_RETRIES,
+    backoff_base=0.5,
+    backoff_cap=20.0,
+)
+ESPN_CONCURRENCY_LIMIT.set_function(lambda: _ESPN_LIMITER.limit)
+ESPN_WAITING.set_function(lambda: _ESPN_LIMITER.gate.waiting)
+
+# ---------- Outbound Discord pacing ----------
+# Discord allows 50 requests/s per bot and about 5 messages per 5 s per channel.
+# Sends and edits queue per channel under both limits (a little below them), so
+# an auto-post burst waits here rather than turning into a run of 429s.
+DISCORD_GLOBAL_RATE = float(os.getenv("DISCORD_GLOBAL_RATE", "40"))     # requests/s across all channels (0 = off)
+DISCORD_ROUTE_RATE = float(os.getenv("DISCORD_ROUTE_RATE", "1"))        # requests/s per channel (0 = off)
+DISCORD_ROUTE_BURST = int(os.getenv("DISCORD_ROUTE_BURST", "5"))
+_OUTBOX = Outbox(DISCORD_GLOBAL_RATE, DISCORD_ROUTE_RATE, DISCORD_ROUTE_BURST)
+DISCORD_OUTBOX_DEPTH.set_function(lambda: _OUTBOX.depth)
+
+# Native async reads (box scores, league state) over a pooled aiohttp session instead of espn_api
+ESPN_ASYNC_CLIENT = os.getenv("ESPN_ASYNC_CLIENT", "0") == "1"
+_ESPN_CLIENT = EspnClient()
+
+def _count_espn_call():
+    cache = _RECAP_CACHE.get()
+    if cache is not None:
+        cache.espn_calls += 1
 
 async def espn_call(func, *args, **kwargs):
     """
     Run a blocking espn_api call in a worker thread with:
-      - global concurrency limit (queue instead of fail)
+      - global rate and adaptive concurrency limit (queue instead of fail)
       - timeout guard
+      - backoff + retry when ESPN throttles or errors
+    """
+    _count_espn_call()
+    # A timeout can't stop the thread, so it keeps its limiter slot and isn't retried
+    return await _timed_espn_call(
+        getattr(func, "__name__", "espn_api"),
+        lambda: asyncio.to_thread(func, *args, **kwargs),
+        cancellable=False
+    )
+
+async def espn_call_async(coro_func, *args, **kwargs):
+    """Same limiter, timeout and retries as espn_call, for native async ESPN requests."""
+    _count_espn_call()
+    return await _timed_espn_call(coro_func.__name__, lambda: coro_func(*args, **kwargs))
+
+async def _timed_espn_call(name: str, make_awaitable, cancellable: bool = True):
+    started = time.perf_counter()
+    outcome = "error"
+    try:
+        result = await _ESPN_LIMITER.call(make_awaitable, timeout=ESPN_TIMEOUT_SECONDS, cancellable=cancellable)
+        outcome = "ok"
+        return result
+    finally:
+        ESPN_CALL_SECONDS.observe(time.perf_counter() - started, call=name, outcome=outcome)
+
+# ---------- Per-recap box-score cache ----------
+class RecapCache:
+    """Box scores fetched during one recap, shared by every embed builder."""
+    def __init__(self, label: str):
+        self.label = label
+        self.espn_calls = 0
+        self.box_scores: dict[tuple[int, int, int], asyncio.Future] = {}
+
+_RECAP_CACHE: contextvars.ContextVar[RecapCache | None] = contextvars.ContextVar("recap_cache", default=None)
+
+@contextmanager
+def recap_scope(label: str, kind: str = "recap"):
+    """
+    Memoize box scores for the duration of one recap build.
+    Logs how many ESPN calls the recap needed once it finishes.
+    """
+    cache = RecapCache(label)
+    token = _RECAP_CACHE.set(cache)
+    try:
+        yield cache
+    finally:
+        _RECAP_CACHE.reset(token)
+        ESPN_CALLS_PER_RECAP.observe(cache.espn_calls, kind=kind)
+        print(f"📊 {label}: {cache.espn_calls} ESPN calls ({len(cache.box_scores)} weeks of box scores)")
+
+def _league_key(league) -> tuple[int, int]:
+    return int(getattr(league, "league_id", 0) or 0), int(getattr(league, "year", 0) or 0)
+
+def _league_creds(league) -> dict:
+    cookies = getattr(getattr(league, "espn_request", None), "cookies", None) or {}
+    return {"swid": cookies.get("SWID"), "espn_s2": cookies.get("espn_s2")}
+
+def _matchup_period(league, week: int) -> int:
+    # Playoff matchups can span several scoring periods
+    periods = getattr(getattr(league, "settings", None), "matchup_periods", None) or {}
+    for matchup_id, weeks in periods.items():
+        if week in weeks:
+            return int(matchup_id)
+    return week
+
+async def _refresh_league_async(league) -> None:
+    """
+    Async stand-in for league.refresh(): current week and team records via mTeam.
+    Teams are replaced with updated copies, never changed in place.
+    """
+    league_id, season = _league_key(league)
+    state = await espn_call_async(_ESPN_CLIENT.fetch_league_state, league_id, season, **_league_creds(league))
+    if state["current_week"]:
+        league.current_week = state["current_week"]
+        league.nfl_week = state["nfl_week"]
+        league.currentMatchupPeriod = state["current_matchup_period"]
+    league.teams = [copy.copy(t) for t in getattr(league, "teams", [])]
+    teams = {getattr(t, "team_id", None): t for t in league.teams}
+    for row in state["teams"]:
+        team = teams.get(row["team_id"])
+        if team is None:
+            continue
+        team.wins = row["wins"]
+        team.losses = row["losses"]
+        team.points_for = row["points_for"]
+        team.points_against = row["points_against"]
+
+def _current_week(league) -> int:
+    """Robust current week: current_week, then nfl_week, never below 1."""
+    week = (
+        int(getattr(league, "current_week", 0) or 0)
+        or int(getattr(league, "nfl_week", 0) or 0)
+        or 1
+    )
+    return max(1, week)
+
+# ---------- Durable box-score cache (finalized weeks) ----------
+class CachedTeam:
+    """Stand-in for a fantasy team that is no longer in league.teams."""
+    def __init__(self, team_id: int, team_name: str):
+        self.team_id = team_id
+        self.team_name = team_name
+        self.wins = 0
+        self.losses = 0
+
+class CachedBoxPlayer:
+    __slots__ = ("playerId", "name", "position", "slot_position", "points")
+
+    def __init__(self, player_id, name, position, slot_position, points):
+        self.playerId = player_id
+        self.name = name
+        self.position = position
+        self.slot_position = slot_position
+        self.points = points
+
+class CachedBoxScore:
+    """Same attributes the embed builders read from espn_api's BoxScore."""
+    __slots__ = ("home_team", "away_team", "home_score", "away_score", "home_lineup", "away_lineup")
+
+    def __init__(self, home_team, away_team, home_score, away_score):
+        self.home_team = home_team
+        self.away_team = away_team
+        self.home_score = home_score
+        self.away_score = away_score
+        self.home_lineup: list[CachedBoxPlayer] = []
+        self.away_lineup: list[CachedBoxPlayer] = []
+
+def _team_id(team) -> int:
+    # espn_api leaves a bare int (0) in place of the team on bye weeks
+    if isinstance(team, int):
+        return team
+    return int(getattr(team, "team_id", 0) or 0)
+
+def _normalize_box_scores(week_boxes) -> tuple[list[tuple], list[tuple]]:
+    """Flatten box scores into the (games, players) rows stored by settings_manager."""
+    games: list[tuple] = []
+    players: list[tuple] = []
+    for i, game in enumerate(week_boxes):
+        games.append((
+            i,
+            _team_id(game.home_team), getattr(game.home_team, "team_name", None), game.home_score,
+            _team_id(game.away_team), getattr(game.away_team, "team_name", None), game.away_score,
+        ))
+        for side, lineup, fteam in (("home", game.home_lineup, game.home_team), ("away", game.away_lineup, game.away_team)):
+            for bp in lineup:
+                players.append((
+                    i, side, _team_id(fteam),
+                    getattr(bp, "playerId", None),
+                    getattr(bp, "name", None),
+                    getattr(bp, "position", None),
+                    getattr(bp, "slot_position", None),
+                    getattr(bp, "points", None),
+                ))
+    return games, players
+
+def _rehydrate_box_scores(league, games, players) -> list[CachedBoxScore]:
+    """Rebuild box-score objects from cached rows, reattaching live Team objects."""
+    teams = {getattr(t, "team_id", None): t for t in getattr(league, "teams", [])}
+
+    def resolve(team_id, team_name):
+        if not team_id:
+            return 0
+        return teams.get(team_id) or CachedTeam(team_id, team_name or "Unknown")
+
+    boxes: dict[int, CachedBoxScore] = {}
+    for game_index, home_id, home_name, home_score, away_id, away_name, away_score in games:
+        boxes[game_index] = CachedBoxScore(
+            resolve(home_id, home_name), resolve(away_id, away_name), home_score, away_score
+        )
+    for game_index, side, _team, player_id, name, position, slot, points in players:
+        box = boxes.get(game_index)
+        if box is None:
+            continue
+        lineup = box.home_lineup if side == "home" else box.away_lineup
+        lineup.append(CachedBoxPlayer(player_id, name, position, slot, points))
+    return [boxes[i] for i in sorted(boxes)]
+
+class WeekData:
     """
-    async with _ESPN_GATE:
-        return await asyncio.wait_for(
-            asyncio.to_thread(func, *args, **kwargs),
-            timeout=ESPN_TIMEOUT_SECONDS
+    One week as loaded: the flat (games, players) rows settings_manager stores,
+    plus box-score objects and a WeekTable, each built on first use. `final`
+    weeks won't change any more (past the stat-correction window).
+    """
+    __slots__ = ("games", "players", "boxes", "table", "final")
+
+    def __init__(self, games, players, boxes=None, final=False):
+        self.games = games
+        self.players = players
+        self.boxes = boxes
+        self.table: WeekTable | None = None
+        self.final = final
+
+# ESPN moves on to the next scoring period before stat corrections land, so a past
+# week is only frozen in SQLite by the first fetch this long after it closed
+STAT_CORRECTION_SECONDS = int(os.getenv("STAT_CORRECTION_SECONDS", str(3 * 86400)))
+
+async def _load_week(league, week: int) -> WeekData:
+    """
+    A week's box scores: finalized weeks come from the SQLite cache when
+    present; everything else is fetched from ESPN and written back. A past
+    week is marked final once it's fetched after the stat-correction window.
+    """
+    league_id, season = _league_key(league)
+    is_past = week < _current_week(league)
+    closed_at = None
+    if is_past:
+        try:
+            cached = await get_box_score_week(league_id, season, week)
+            CACHE_LOOKUPS.inc(cache="box_score_sqlite", result="hit" if cached else "miss")
+            if cached:
+                return WeekData(*cached, final=True)
+            closed_at = await get_box_score_closed_at(league_id, season, week)
+        except Exception as e:
+            print(f"⚠️ Box-score cache read failed for league {league_id} week {week}: {e}")
+
+    if ESPN_ASYNC_CLIENT:
+        # One request instead of espn_api's three; rows feed both the cache and the builders
+        team_names = {getattr(t, "team_id", None): getattr(t, "team_name", None) for t in getattr(league, "teams", [])}
+        games, players = await espn_call_async(
+            _ESPN_CLIENT.fetch_box_score_rows, league_id, season, week,
+            matchup_period=_matchup_period(league, week), team_names=team_names, **_league_creds(league)
         )
+        data = WeekData(games, players)
+    else:
+        week_boxes = await espn_call(league.box_scores, week=week)
+        data = WeekData(*_normalize_box_scores(week_boxes), boxes=week_boxes)
+    if is_past:
+        closed_at = closed_at or time.time()
+        data.final = time.time() - closed_at >= STAT_CORRECTION_SECONDS
+    try:
+        await save_box_score_week(league_id, season, week, data.games, data.players, data.final, closed_at)
+    except Exception as e:
+        print(f"⚠️ Box-score cache write failed for league {league_id} week {week}: {e}")
+    return data
 
-# ---- Global job queue (all guilds share this) ----
-_GLOBAL_QUEUE: asyncio.Queue[discord.Interaction] = asyncio.Queue()
-_GLOBAL_WORKERS: list[asyncio.Task] = []
+async def _fetch_week(league, week: int) -> WeekData:
+    """
+    A week's data, fetched at most once per (league, season, week) inside a
+    recap_scope. Concurrent callers share the same in-flight request.
+    """
+    cache = _RECAP_CACHE.get()
+    if cache is None:
+        return await _load_week(league, week)
+
+    key = (*_league_key(league), int(week))
+    fut = cache.box_scores.get(key)
+    CACHE_LOOKUPS.inc(cache="box_score_memo", result="hit" if fut else "miss")
+    if fut is None:
+        fut = asyncio.ensure_future(_load_week(league, week))
+        cache.box_scores[key] = fut
+    try:
+        return await fut
+    except Exception:
+        # Don't memoize failures; a later builder may retry this week
+        if cache.box_scores.get(key) is fut:
+            del cache.box_scores[key]
+        raise
+
+async def fetch_box_scores(league, week: int):
+    """Box-score objects for a week (espn_api's, or rebuilt from cached rows)."""
+    data = await _fetch_week(league, week)
+    if data.boxes is None:
+        data.boxes = _rehydrate_box_scores(league, data.games, data.players)
+    return data.boxes
+
+def _week_table(league, data: WeekData) -> "WeekTable":
+    if data.table is None:
+        data.table = WeekTable(league, data.games, data.players)
+    return data.table
+
+async def fetch_week_table(league, week: int) -> "WeekTable":
+    """Columnar view of a week for the builders that only need player points."""
+    return _week_table(league, await _fetch_week(league, week))
+
+# ---------- Columnar week tables ----------
+class WeekTable:
+    """
+    One week of player rows as columns, built straight from the cached row
+    layout. Rows are every lineup player with points; pos is an index into
+    DESIRED_POSITIONS, or -1 for positions the recap doesn't track.
+    """
+    __slots__ = ("player_ids", "names", "teams", "pos", "bench", "points", "team_scores")
+
+    def __init__(self, league, games, players):
+        # Same team names the box-score objects would carry: live team, else the cached name
+        live = {getattr(t, "team_id", None): getattr(t, "team_name", "Unknown") for t in getattr(league, "teams", [])}
+        team_names = {}
+        for _, home_id, home_name, _, away_id, away_name, _ in games:
+            for team_id, name in ((home_id, home_name), (away_id, away_name)):
+                team_names[team_id] = live[team_id] if team_id in live else (name or "Unknown")
+        team_names[0] = team_names[None] = "Unknown"
+
+        rows = [p for p in players if p[7] is not None]
+        _, _, team_ids, player_ids, names, positions, slots, points = zip(*rows) if rows else ((),) * 8
+        codes = _POSITION_CODES
+        self.player_ids = player_ids
+        self.names = names
+        self.teams = [team_names.get(tid, "Unknown") for tid in team_ids]
+        self.pos = np.fromiter((codes.get(p, -1) for p in positions), dtype=np.int8, count=len(rows))
+        self.bench = np.fromiter((s == "BE" for s in slots), dtype=bool, count=len(rows))
+        self.points = np.array(points, dtype=np.float64)
+        self.team_scores = np.array(
+            [score for g in games for score in (g[3], g[6]) if score is not None], dtype=np.float64
+        )
 
-# Still keep a per-guild lock so two jobs from the SAME server don't overlap
-_GUILD_LOCKS = defaultdict(asyncio.Lock)
+    def eligible(self, starters_only: bool) -> np.ndarray:
+        return ~self.bench if starters_only else np.ones(len(self.points), dtype=bool)
 
-# How many jobs to process in parallel (separate from ESPN_MAX_CONCURRENCY)
-QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", "1"))  # 1 = strict FIFO; >1 = parallel consumption
+# ---- Global job scheduler (all guilds share this) ----
+class RecapJob:
+    """
+    Gateway-side handle on a guild's unfinished /weeklyrecap (a recap_jobs row);
+    repeat clicks attach their interactions to it and all get the result.
+    """
+    def __init__(self, guild_id: int, job_id: int):
+        self.guild_id = guild_id
+        self.job_id = job_id
+        self.interactions: list[discord.Interaction] = []
+
+    def followup(self, content: str):
+        # Queued, not awaited: the outbox merges notes still pending for the same interaction
+        for interaction in self.interactions:
+            _OUTBOX.followup(interaction, content)
+
+class RecapJobError(Exception):
+    """A recap that can't be built for a reason worth telling the user; not retried."""
+
+class ScheduledJob:
+    """Background work (auto-post, pre-render) for one league; `done` resolves when it finishes."""
+    priority = PRIORITY_SCHEDULED
+
+    def __init__(self, key, label: str, work):
+        self.key = key
+        self.label = label
+        self.work = work
+        self.done: asyncio.Future = asyncio.get_running_loop().create_future()
+
+    async def run(self):
+        result = await self.work()
+        if not self.done.done():
+            self.done.set_result(result)
+
+    async def fail(self, e: Exception):
+        print(f"❌ {self.label} failed: {e}")
+        if not self.done.done():
+            self.done.set_result(None)
+
+# Interactive recaps are durable recap_jobs rows (see settings_manager); scheduled work stays in memory
+_SCHEDULER = RecapScheduler()
+_RECAP_JOB_COUNTS: dict[str, int] = {"queued": 0, "running": 0}  # refreshed by the delivery loop
+QUEUE_DEPTH.set_function(lambda: {
+    ("interactive",): _RECAP_JOB_COUNTS["queued"],
+    ("scheduled",): _SCHEDULER.qsize(),
+})
+_RECAP_BUILDERS: list[asyncio.Task] = []
+_SCHEDULED_WORKERS: list[asyncio.Task] = []
+_RECAP_DELIVERY: list[asyncio.Task] = []
+_LIVE_SCORING: list[asyncio.Task] = []
+
+# Guild id -> its unfinished recap job, so duplicate requests coalesce instead of queueing again
+_GUILD_JOBS: dict[int, RecapJob] = {}
+
+# Recap builders per process (separate from the ESPN limiter). One unfinished job per
+# guild, claimed oldest first, so guilds are served round-robin. With
+# EXTERNAL_RECAP_WORKERS=1 the gateway only sends, and recap_worker.py processes build.
+QUEUE_WORKERS = int(os.getenv("QUEUE_WORKERS", "1"))
+EXTERNAL_RECAP_WORKERS = os.getenv("EXTERNAL_RECAP_WORKERS", "0") == "1"
+RECAP_WORKER_PROCESSES = int(os.getenv("RECAP_WORKER_PROCESSES", "2"))
+# Workers for scheduled work (auto-post, pre-render); these never pick up interactive jobs
+SCHEDULED_WORKERS = int(os.getenv("SCHEDULED_WORKERS", "4"))
+
+# A builder renews its lease every third of this; a lapsed lease means the builder died
+RECAP_JOB_LEASE_SECONDS = int(os.getenv("RECAP_JOB_LEASE_SECONDS", "60"))
+RECAP_JOB_MAX_ATTEMPTS = int(os.getenv("RECAP_JOB_MAX_ATTEMPTS", "3"))
+RECAP_JOB_POLL_SECONDS = float(os.getenv("RECAP_JOB_POLL_SECONDS", "1"))  # picks up other processes' jobs
+RECAP_JOB_RETENTION_SECONDS = 86400
+# Posted recaps stay browsable this long (a season by default)
+NAVIGATOR_RETENTION_SECONDS = int(os.getenv("NAVIGATOR_RETENTION_DAYS", "180")) * 86400
+# Set when this process queues or finishes a job, so its own loops don't wait for the poll
+_RECAP_JOBS_QUEUED = asyncio.Event()
+_RECAP_JOBS_FINISHED = asyncio.Event()
+_RECAP_JOB_AVG_SECONDS = 30.0
+
+# How many week pages one recap builds at once (ESPN calls still go through the limiter)
+RECAP_FANOUT = int(os.getenv("RECAP_FANOUT", "3"))
 
 # ---------- ESPN image/constants ----------
 PLAYER_IMG = "https://a.espncdn.com/i/headshots/nfl/players/full/{player_id}.png"
@@ -78,75 +573,270 @@ TEAM_LOGO = {
     "Titans": "ten", "Vikings": "min"
 }
 DESIRED_POSITIONS = ['QB', 'RB', 'WR', 'TE', 'K', 'D/ST']
+# Position (including espn_api's D/ST aliases) -> index into DESIRED_POSITIONS
+_POSITION_CODES = {pos: i for i, pos in enumerate(DESIRED_POSITIONS)}
+_POSITION_CODES.update({alias: _POSITION_CODES["D/ST"] for alias in ("DST", "DEF", "Def")})
+
+# ---------- Shared League pool ----------
+# League(...) makes several blocking HTTP calls, and many guilds point at the same league.
+LEAGUE_POOL_TTL_SECONDS = int(os.getenv("LEAGUE_POOL_TTL_SECONDS", "21600"))       # rebuild after this long
+LEAGUE_REFRESH_SECONDS = int(os.getenv("LEAGUE_REFRESH_SECONDS", "300"))          # league.refresh() after this long
+LEAGUE_POOL_MAX = int(os.getenv("LEAGUE_POOL_MAX", "64"))                         # LRU cap on pooled leagues
+
+class _PooledLeague:
+    __slots__ = ("league", "created_at", "refreshed_at")
+
+    def __init__(self, league: League):
+        now = time.monotonic()
+        self.league = league
+        self.created_at = now
+        self.refreshed_at = now
+
+_LEAGUE_POOL: OrderedDict[tuple[int, int, str], _PooledLeague] = OrderedDict()
+_LEAGUE_POOL_LOCKS = defaultdict(asyncio.Lock)
+
+def _league_pool_key(settings) -> tuple[int, int, str]:
+    creds = f"{settings['swid']}|{settings['espn_s2']}".encode()
+    return int(settings["league_id"]), int(settings["season"]), hashlib.sha256(creds).hexdigest()
+
+async def get_pooled_league(settings) -> League:
+    """
+    Shared League for (league_id, season, credentials).
+    Fresh entries are reused as-is, stale ones get a cheap league.refresh()
+    (teams, records, current week), and entries past the TTL are rebuilt.
+    Refreshes run on a copy that then replaces the pooled League: espn_api
+    rebuilds league.teams in place, and other recaps may be reading the old one.
+    """
+    key = _league_pool_key(settings)
+    async with _LEAGUE_POOL_LOCKS[key]:
+        now = time.monotonic()
+        entry = _LEAGUE_POOL.get(key)
+        if entry and now - entry.created_at < LEAGUE_POOL_TTL_SECONDS:
+            if now - entry.refreshed_at >= LEAGUE_REFRESH_SECONDS:
+                try:
+                    fresh = copy.copy(entry.league)
+                    if ESPN_ASYNC_CLIENT:
+                        await _refresh_league_async(fresh)
+                    else:
+                        await espn_call(fresh.refresh)
+                    entry.league = fresh
+                    entry.refreshed_at = time.monotonic()
+                except Exception as e:
+                    print(f"⚠️ League refresh failed for {key[0]}, rebuilding: {e}")
+                    entry = None
+            if entry:
+                CACHE_LOOKUPS.inc(cache="league_pool", result="hit")
+                _LEAGUE_POOL.move_to_end(key)
+                return entry.league
+
+        CACHE_LOOKUPS.inc(cache="league_pool", result="miss")
+        # espn_api does network IO in League(...), so offload it too
+        league = await espn_call(
+            League,
+            league_id=key[0],
+            year=key[1],
+            espn_s2=settings["espn_s2"],
+            swid=settings["swid"]
+        )
+        _LEAGUE_POOL[key] = _PooledLeague(league)
+        _LEAGUE_POOL.move_to_end(key)
+        while len(_LEAGUE_POOL) > LEAGUE_POOL_MAX:
+            old_key, _ = _LEAGUE_POOL.popitem(last=False)
+            _LEAGUE_POOL_LOCKS.pop(old_key, None)
+        return league
 
 # ---------- Helpers ----------
 async def build_league_from_settings(settings) -> League:
-    # espn_api does network IO in League(...), so offload it too
-    return await espn_call(
-        League,
-        league_id=int(settings["league_id"]),
-        year=int(settings["season"]),
-        espn_s2=settings["espn_s2"],
-        swid=settings["swid"]
-    )
+    return await get_pooled_league(settings)
 
-# ---------- Reports ----------
-async def send_to_home_webhook(report_type: str, embed: discord.Embed, gh_url: str, jump_url: str):
+def _group_by_league(guild_settings, owned: bool = True, live: bool = False) -> dict[tuple[int, int], tuple[list[dict], list[dict]]]:
     """
-    report_type: 'bug' or 'feedback'
-    embed:       the embed you already built for the in-guild notification
-    gh_url:      the prefilled GitHub issue link
-    jump_url:    the Discord 'jump to interaction' URL
+    Guild settings grouped by (league_id, season), so each league is fetched
+    once whatever the number of servers: {key: (candidates, guild_settings)}.
+    Guilds sharing a league may have different cookies; candidates holds one
+    settings per distinct set, to try in order until one works.
+    owned: only guilds this process owns. live: only guilds with live scoring on.
     """
-    url = HOME_BUGS_WEBHOOK_URL if report_type == "bug" else HOME_FEEDBACK_WEBHOOK_URL
-    if not url:
-        # Optional: DM fallback
-        if OWNER_ID:
-            try:
-                owner = await bot.fetch_user(OWNER_ID)
-                # Include links in the DM in case components aren't supported
-                dm_embed = embed.copy()
-                dm_embed.add_field(name="GitHub Issue", value=gh_url, inline=False)
-                dm_embed.add_field(name="Jump to Interaction", value=jump_url, inline=False)
-                await owner.send(embed=dm_embed)
-                return True
-            except Exception:
-                return False
-        return False
+    groups: dict[tuple[int, int], tuple[list[dict], list[dict]]] = {}
+    for settings in guild_settings:
+        if owned and not owns_guild(settings["guild_id"]):
+            continue
+        if live and not settings.get("live_enabled"):
+            continue
+        candidates, guilds = groups.setdefault((settings["league_id"], settings["season"]), ([], []))
+        if all((c["swid"], c["espn_s2"]) != (settings["swid"], settings["espn_s2"]) for c in candidates):
+            candidates.append(settings)
+        guilds.append(settings)
+    return groups
 
+# ---------- Reports ----------
+# /feedback and /bugreport only queue their report and answer the user; one task
+# delivers them to the home server over a session kept for the bot's lifetime,
+# packing a burst of reports into as few webhook messages as possible.
+REPORT_MAX_ATTEMPTS = int(os.getenv("REPORT_MAX_ATTEMPTS", "4"))            # webhook tries before the owner DM
+REPORT_BATCH_SECONDS = float(os.getenv("REPORT_BATCH_SECONDS", "2"))       # how long a burst may gather
+REPORT_BATCH_EMBEDS = 10     # Discord's per-message limits
+REPORT_BATCH_CHARS = 6000
+
+class HomeReport:
+    __slots__ = ("report_type", "embed", "gh_url", "jump_url", "attempts", "done")
+
+    def __init__(self, report_type: str, embed: discord.Embed, gh_url: str, jump_url: str):
+        self.report_type = report_type  # 'bug' or 'feedback'
+        self.embed = embed
+        self.gh_url = gh_url            # the prefilled GitHub issue link
+        self.jump_url = jump_url        # the Discord 'jump to interaction' URL
+        self.attempts = 0
+        self.done = False               # sent, or given up on after the owner DM fallback
+
+    def with_links(self) -> discord.Embed:
+        """The embed with its links as fields, for messages that can't carry buttons."""
+        e = self.embed.copy()
+        e.add_field(name="GitHub Issue", value=self.gh_url, inline=False)
+        e.add_field(name="Jump to Interaction", value=self.jump_url, inline=False)
+        return e
+
+_REPORT_QUEUE: asyncio.Queue[HomeReport] = asyncio.Queue()
+_REPORT_DELIVERY: list[asyncio.Task] = []
+# Reports waiting out a retry backoff, so shutdown can still collect them
+_REPORT_RETRIES: dict[HomeReport, asyncio.TimerHandle] = {}
+_HOME_SESSION: aiohttp.ClientSession | None = None
+
+def _home_session() -> aiohttp.ClientSession:
+    global _HOME_SESSION
+    if _HOME_SESSION is None or _HOME_SESSION.closed:
+        _HOME_SESSION = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+    return _HOME_SESSION
+
+def queue_home_report(report_type: str, embed: discord.Embed, gh_url: str, jump_url: str):
+    """Hand a report to the delivery task; returns at once."""
+    _REPORT_QUEUE.put_nowait(HomeReport(report_type, embed, gh_url, jump_url))
+
+async def _dm_owner(report: HomeReport) -> bool:
+    if not OWNER_ID:
+        return False
     try:
-        async with aiohttp.ClientSession() as session:
-            webhook = Webhook.from_url(url, session=session)
-
-            # Try sending with buttons first
-            view = discord.ui.View()
-            view.add_item(discord.ui.Button(label="Open GitHub Issue", url=gh_url))
-            view.add_item(discord.ui.Button(label="Jump to Interaction", url=jump_url))
-            await webhook.send(embed=embed, view=view, wait=True)
-            return True
+        owner = bot.get_user(OWNER_ID) or await bot.fetch_user(OWNER_ID)
+        # Include links in the DM in case components aren't supported
+        await owner.send(embed=report.with_links())
+        return True
     except Exception:
+        return False
+
+async def _post_reports(url: str, reports: list[HomeReport]):
+    webhook = Webhook.from_url(url, session=_home_session())
+    if len(reports) > 1:
+        with DISCORD_SEND_SECONDS.time(target="webhook"):
+            await webhook.send(embeds=[r.with_links() for r in reports], wait=True)
+        return
+    report = reports[0]
+    # Try sending with buttons first
+    view = discord.ui.View()
+    view.add_item(discord.ui.Button(label="Open GitHub Issue", url=report.gh_url))
+    view.add_item(discord.ui.Button(label="Jump to Interaction", url=report.jump_url))
+    try:
+        with DISCORD_SEND_SECONDS.time(target="webhook"):
+            await webhook.send(embed=report.embed, view=view, wait=True)
+    except Exception as e:
+        if is_throttle_error(e):
+            raise
         # Fallback: no components, just links in the embed
+        with DISCORD_SEND_SECONDS.time(target="webhook"):
+            await webhook.send(embed=report.with_links(), wait=True)
+
+def _report_batches(reports: list[HomeReport]):
+    """Split reports into webhook messages under Discord's embed count and size limits."""
+    batch, size = [], 0
+    for report in reports:
+        length = len(report.with_links())
+        if batch and (len(batch) >= REPORT_BATCH_EMBEDS or size + length > REPORT_BATCH_CHARS):
+            yield batch
+            batch, size = [], 0
+        batch.append(report)
+        size += length
+    if batch:
+        yield batch
+
+async def _deliver_reports(reports: list[HomeReport]):
+    url = HOME_BUGS_WEBHOOK_URL if reports[0].report_type == "bug" else HOME_FEEDBACK_WEBHOOK_URL
+    if not url:
+        for report in reports:
+            await _dm_owner(report)
+            report.done = True
+        return
+    for batch in _report_batches(reports):
         try:
-            async with aiohttp.ClientSession() as session:
-                webhook = Webhook.from_url(url, session=session)
-                fallback = embed.copy()
-                fallback.add_field(name="GitHub Issue", value=gh_url, inline=False)
-                fallback.add_field(name="Jump to Interaction", value=jump_url, inline=False)
-                await webhook.send(embed=fallback, wait=True)
-                return True
-        except Exception:
-            # Optional: DM fallback if webhook also fails
-            if OWNER_ID:
+            await _post_reports(url, batch)
+            for report in batch:
+                report.done = True
+            continue
+        except Exception as e:
+            error = e
+        if len(batch) > 1 and not is_throttle_error(error):
+            # Something in the batch was rejected; send them one at a time
+            for report in batch:
+                await _deliver_reports([report])
+            continue
+        for report in batch:
+            report.attempts += 1
+            if is_throttle_error(error) and report.attempts < REPORT_MAX_ATTEMPTS:
+                delay = min(60.0, 2 ** report.attempts)
+                _REPORT_RETRIES[report] = asyncio.get_running_loop().call_later(delay, _retry_report, report)
+                continue
+            if not await _dm_owner(report):
+                print(f"❌ Couldn’t deliver {report.report_type} report: {error}")
+            report.done = True
+
+def _retry_report(report: HomeReport):
+    _REPORT_RETRIES.pop(report, None)
+    _REPORT_QUEUE.put_nowait(report)
+
+def _by_report_type(reports: list[HomeReport]):
+    for report_type in ("bug", "feedback"):
+        group = [r for r in reports if r.report_type == report_type]
+        if group:
+            yield group
+
+async def report_delivery_loop():
+    while True:
+        reports = [await _REPORT_QUEUE.get()]
+        try:
+            # Let a burst gather so it goes out as a few messages instead of one per report
+            await asyncio.sleep(REPORT_BATCH_SECONDS)
+            while not _REPORT_QUEUE.empty():
+                reports.append(_REPORT_QUEUE.get_nowait())
+            for group in _by_report_type(reports):
                 try:
-                    owner = await bot.fetch_user(OWNER_ID)
-                    dm_embed = embed.copy()
-                    dm_embed.add_field(name="GitHub Issue", value=gh_url, inline=False)
-                    dm_embed.add_field(name="Jump to Interaction", value=jump_url, inline=False)
-                    await owner.send(embed=dm_embed)
-                    return True
-                except Exception:
-                    pass
-            return False
+                    await _deliver_reports(group)
+                except Exception as e:
+                    print(f"⚠️ Report delivery error: {e}")
+        except asyncio.CancelledError:
+            # Shutdown: whatever wasn't sent yet is left for close_home_reports
+            for report in reports:
+                if not report.done and report not in _REPORT_RETRIES:
+                    _REPORT_QUEUE.put_nowait(report)
+            raise
+
+async def close_home_reports(timeout: float = 10.0):
+    """Shutdown: stop the delivery task, make one last attempt at queued reports, close the session."""
+    for task in _REPORT_DELIVERY:
+        task.cancel()
+    await asyncio.gather(*_REPORT_DELIVERY, return_exceptions=True)
+    reports = list(_REPORT_RETRIES)
+    for handle in _REPORT_RETRIES.values():
+        handle.cancel()
+    _REPORT_RETRIES.clear()
+    while not _REPORT_QUEUE.empty():
+        reports.append(_REPORT_QUEUE.get_nowait())
+    for report in reports:
+        report.attempts = REPORT_MAX_ATTEMPTS  # no time left for retries
+    try:
+        for group in _by_report_type(reports):
+            await asyncio.wait_for(_deliver_reports(group), timeout=timeout)
+    except Exception as e:
+        print(f"⚠️ Reports not delivered before shutdown: {e}")
+    if _HOME_SESSION is not None:
+        await _HOME_SESSION.close()
 
 # --- GitHub Issues URL ---
 def _github_issue_url(title: str, body: str) -> str:
@@ -157,63 +847,96 @@ def _github_issue_url(title: str, body: str) -> str:
     return f"{base}?{urllib.parse.urlencode(params)}"
 
 # --- Scoring precision detection (0, 1, or 2 decimal places) ---
-_PRECISION_CACHE: dict[int, int] = {}
+# Settled precision per (league_id, season); SQLite keeps it across restarts
+PRECISION_CACHE_MAX = int(os.getenv("PRECISION_CACHE_MAX", "1024"))
+_PRECISION_CACHE: OrderedDict[tuple[int, int], int] = OrderedDict()
 
 def _fmt_points(val: float | int | None, precision: int) -> str:
     if val is None:
         return "0"
     return f"{float(val):.{precision}f}"
 
-async def detect_scoring_precision(league) -> int:
+def _decimals(values: np.ndarray, max_places: int = 2) -> int:
+    """Fewest decimal places (up to max_places) that represent every value exactly."""
+    for p in range(max_places + 1):
+        scaled = values * (10 ** p)
+        if np.all(np.abs(np.round(scaled) - scaled) < 1e-6):
+            return p
+    return max_places
+
+def _scoring_rules_precision(league) -> int | None:
     """
-    Infer precision by sampling box score values and checking if they
-    align to 0, 1, or 2 decimal places. Caches per-league.
+    Most decimal places the loaded scoring rules add (e.g. 0.04/yd -> 2, 0.5/rec -> 1).
+    Only a floor: espn_api keeps just the D/ST per-position overrides, so a
+    fractional TE premium, say, isn't in here. None if the league has none.
     """
-    league_id = int(getattr(league, "league_id", 0) or 0)
-    if league_id in _PRECISION_CACHE:
-        return _PRECISION_CACHE[league_id]
-
-    # Choose up to two weeks to sample: current and week 1 (defensive)
-    current_week = (
-        int(getattr(league, "current_week", 0) or 0)
-        or int(getattr(league, "nfl_week", 0) or 0)
-        or 1
-    )
-    weeks_to_try = [max(1, current_week)]
-    if current_week != 1:
-        weeks_to_try.append(1)
+    rules = getattr(getattr(league, "settings", None), "scoring_format", None)
+    if not rules:
+        return None
+    return _decimals(np.array([float(r.get("points") or 0) for r in rules]))
+
+def _remember_precision(key: tuple[int, int], precision: int) -> None:
+    _PRECISION_CACHE[key] = precision
+    _PRECISION_CACHE.move_to_end(key)
+    while len(_PRECISION_CACHE) > PRECISION_CACHE_MAX:
+        _PRECISION_CACHE.popitem(last=False)
+
+async def _probe_scoring_precision(league) -> tuple[int | None, bool]:
+    """
+    Precision from sampled box scores, never below what the known scoring rules
+    need, and whether it's settled: rules at the 2-place maximum, or a sampled
+    week that is final. A live or pre-correction week may not show the league's
+    decimals yet. (None, False) if there was nothing to sample yet.
+    """
+    floor = _scoring_rules_precision(league) or 0
+    if floor >= 2:
+        return 2, True
 
-    samples: list[float] = []
-    for wk in weeks_to_try:
+    # Once week 1 is final it comes from SQLite rather than ESPN
+    precision, settled = None, False
+    for wk in dict.fromkeys((1, _current_week(league))):
         try:
-            boxes = await espn_call(league.box_scores, week=wk)
-            for g in boxes:
-                # team scores
-                if g.home_score is not None: samples.append(float(g.home_score))
-                if g.away_score is not None: samples.append(float(g.away_score))
-                # player points
-                for lineup in (g.home_lineup, g.away_lineup):
-                    for bp in lineup:
-                        pts = getattr(bp, "points", None)
-                        if pts is not None:
-                            samples.append(float(pts))
+            data = await _fetch_week(league, wk)
         except Exception:
             continue
+        table = _week_table(league, data)
+        # Team scores and player points
+        values = np.concatenate((table.team_scores, table.points))
+        if np.any(values):
+            precision = max(precision or floor, _decimals(values, 2))
+            settled = settled or data.final
+    return precision, settled
+
+@BUILD_SECONDS.timed(stage="precision")
+async def detect_scoring_precision(league) -> int:
+    """
+    Decimal places for a league season, probed until a final week confirms
+    it, then stored per (league_id, season). Falls back to 2 (unstored) while
+    there's no data.
+    """
+    key = _league_key(league)
+    precision = _PRECISION_CACHE.get(key)
+    CACHE_LOOKUPS.inc(cache="precision", result="hit" if precision is not None else "miss")
+    if precision is not None:
+        _PRECISION_CACHE.move_to_end(key)
+        return precision
 
-    # Fallback if we couldn't sample anything
-    if not samples:
-        _PRECISION_CACHE[league_id] = 2
-        return 2
-
-    # Check which precision cleanly represents all samples
-    for p in (0, 1, 2):
-        mult = 10 ** p
-        if all(abs(round(v * mult) - v * mult) < 1e-6 for v in samples):
-            _PRECISION_CACHE[league_id] = p
-            return p
-
-    _PRECISION_CACHE[league_id] = 2
-    return 2
+    try:
+        precision = await get_league_precision(*key)
+    except Exception as e:
+        print(f"⚠️ Could not read stored precision for league {key[0]}: {e}")
+    if precision is None:
+        precision, settled = await _probe_scoring_precision(league)
+        if precision is None:
+            return 2  # preseason: try again next time
+        if not settled:
+            return precision  # only live or pre-correction weeks so far: probe again next time
+        try:
+            await save_league_precision(*key, precision)
+        except Exception as e:
+            print(f"⚠️ Could not store precision for league {key[0]}: {e}")
+    _remember_precision(key, precision)
+    return precision
 
 def _pick_welcome_channel(guild: discord.Guild) -> discord.abc.Messageable | None:
     # Prefer the server’s system channel if we can talk there
@@ -288,6 +1011,7 @@ async def help_cmd(interaction: discord.Interaction):
             "• **/configure** — Update one or more saved settings.\n"
             "• **/weeklyrecap** — Manually post the weekly recap.\n"
             "• **/autopost** — Enable/disable Tuesday 11:00 AM ET autoposting.\n"
+            "• **/livescores** — Enable/disable a pinned scoreboard that updates during games.\n"
             "• **/show_settings** — Show League ID, Season, Channel, and Autopost.\n"
             "• **/help** — Show this help. \n"
             "• **/feedback** — Send feedback or feature requests. \n"
@@ -307,70 +1031,155 @@ async def help_cmd(interaction: discord.Interaction):
 
     await interaction.followup.send(embeds=[intro, setup, commands, footer], ephemeral=True)
 
-async def _process_weeklyrecap(interaction: discord.Interaction):
-    """Runs the actual recap build/send for a single guild request."""
-    settings = await get_guild_settings(str(interaction.guild.id))
+async def build_recap_job(job: dict) -> dict:
+    """
+    Build a queued recap's page; runs in any process, so it only needs the
+    database and ESPN. Returns the fields finish_recap_job stores.
+    """
+    # Read the row itself: a worker process doesn't see the gateway's settings cache
+    settings = await get_guild_settings(job["guild_id"], use_cache=False)
     if not settings:
-        await interaction.followup.send("❌ This server hasn't been set up. Use `/setup` first.", ephemeral=True)
-        return
+        raise RecapJobError("❌ This server hasn't been set up. Use `/setup` first.")
 
-    # Target channel (prefer configured channel)
-    channel = (
-        interaction.guild.get_channel(int(settings["channel_id"]))
-        if settings.get("channel_id") else interaction.channel
-    )
+    with recap_scope(f"Recap for guild {job['guild_id']}", kind="interactive"):
+        # Build league + robust current week
+        league = await build_league_from_settings(settings)
+        current_week = _current_week(league)
+        league_id, season = _league_key(league)
 
-    # Permission check
-    perms = channel.permissions_for(interaction.guild.me)
-    if not perms.send_messages or not perms.embed_links:
-        await interaction.followup.send(
-            f"❌ I don’t have permission to post embeds in {channel.mention}.",
-            ephemeral=True
-        )
-        return
-
-    # Build league + robust current week
-    league = await build_league_from_settings(settings)
-    current_week = (
-        int(getattr(league, "current_week", 0) or 0)
-        or int(getattr(league, "nfl_week", 0) or 0)
-        or 1
-    )
-    if current_week < 1:
-        current_week = 1
-
-    # Build pages (1..current_week)
-    week_pages: list[list[discord.Embed]] = []
-    for wk in range(1, current_week + 1):
-        try:
-            page = await build_week_page(league, wk)
+        # Post the latest week now (falling back to week 1); the navigator builds other weeks on demand
+        page = None
+        for week in dict.fromkeys((current_week, 1)):
+            try:
+                page = await get_week_page(league, week)
+            except Exception as e:
+                print(f"⚠️ Week {week} failed for league {league_id}: {e}")
             if page:
-                week_pages.append(page)
-        except Exception as inner_e:
-            print(f"⚠️ Skipping week {wk} due to error: {inner_e}")
+                break
+
+    if not page:
+        raise RecapJobError("🤷 I couldn’t find any data to post yet.")
+    return {
+        "league_id": league_id,
+        "season": season,
+        "week": week,
+        "last_week": current_week,
+        "payload": _serialize_page(page),
+    }
 
-    # Fallback to week 1 if nothing
-    if not week_pages:
+async def _keep_lease(job_id: int, token: str):
+    while True:
+        await asyncio.sleep(RECAP_JOB_LEASE_SECONDS / 3)
         try:
-            fallback = await build_week_page(league, 1)
-            if fallback:
-                week_pages.append(fallback)
-        except Exception as fe:
-            print(f"⚠️ Fallback week 1 failed: {fe}")
-
-    if not week_pages:
-        await interaction.followup.send("🤷 I couldn’t find any data to post yet.", ephemeral=True)
-        return
-
-    # Send with navigator
-    view = WeekNavigator(week_pages)
-    await channel.send(embeds=week_pages[-1], view=view)
-
+            if not await renew_recap_job(job_id, token, RECAP_JOB_LEASE_SECONDS):
+                return  # reclaimed after a stall; finishing will be refused
+        except Exception as e:
+            print(f"⚠️ Could not renew lease on recap job {job_id}: {e}")
+
+async def run_recap_job(job: dict, token: str):
+    """Build one claimed job and record the outcome for the gateway."""
+    job_id, guild_id = job["job_id"], job["guild_id"]
+    priority_token = JOB_PRIORITY.set(PRIORITY_INTERACTIVE)
+    QUEUE_WAIT_SECONDS.observe(max(0.0, job["started_at"] - job["created_at"]), priority="interactive")
+    started = time.monotonic()
+    lease = asyncio.create_task(_keep_lease(job_id, token))
+    outcome = "error"
+    try:
+        result = await build_recap_job(job)
+    except RecapJobError as e:
+        await fail_recap_job(job_id, token, str(e))
+    except asyncio.CancelledError:
+        # Shutting down: hand the job straight back instead of waiting out the lease
+        try:
+            await asyncio.shield(fail_recap_job(job_id, token, "worker stopped", retry=True, count_attempt=False))
+        except Exception:
+            pass
+        raise
+    except Exception as e:
+        retry = job["attempts"] < RECAP_JOB_MAX_ATTEMPTS
+        print(f"⚠️ Recap job {job_id} for guild {guild_id} failed (attempt {job['attempts']}): {e}")
+        await fail_recap_job(job_id, token, f"❌ Error while processing queued recap: `{e}`", retry=retry)
+    else:
+        await finish_recap_job(job_id, token, **result)
+        outcome = "ok"
+    finally:
+        lease.cancel()
+        JOB_PRIORITY.reset(priority_token)
+        elapsed = time.monotonic() - started
+        JOB_SECONDS.observe(elapsed, priority="interactive", outcome=outcome)
+        GUILD_JOB_SECONDS.inc(elapsed, guild=guild_id)
+        GUILD_JOBS.inc(guild=guild_id, outcome=outcome)
+        _RECAP_JOBS_FINISHED.set()
+
+async def recap_builder(worker: str):
+    """Claim and build recap jobs forever (gateway builders and recap_worker.py processes)."""
+    while True:
+        _RECAP_JOBS_QUEUED.clear()
+        claimed = None
+        try:
+            claimed = await claim_recap_job(worker, RECAP_JOB_LEASE_SECONDS, RECAP_JOB_MAX_ATTEMPTS)
+            if claimed:
+                await run_recap_job(*claimed)
+        except Exception as e:
+            print(f"❌ Recap builder {worker} error: {e}")
+        if not claimed:
+            try:
+                await asyncio.wait_for(_RECAP_JOBS_QUEUED.wait(), timeout=RECAP_JOB_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
 
-    await interaction.followup.send(
-        f"✅ Weekly recap posted in {channel.mention}.",
-        ephemeral=True
-    )
+async def _deliver_recap_job(row: dict):
+    """Send a finished job (or report its error) and close it."""
+    global _RECAP_JOB_AVG_SECONDS
+    guild_id = int(row["guild_id"])
+    status, note = "failed", row["error"] or "❌ The recap couldn’t be built."
+    guild = bot.get_guild(guild_id)
+    channel = guild.get_channel(int(row["channel_id"])) if guild else None
+    if row["status"] == "built":
+        if row["started_at"]:
+            # Exponential moving average feeds the queue ETA
+            _RECAP_JOB_AVG_SECONDS = 0.8 * _RECAP_JOB_AVG_SECONDS + 0.2 * (row["updated_at"] - row["started_at"])
+        if channel is None:
+            note = "❌ I can’t find the recap channel anymore. Use `/configure` to pick one."
+        elif not channel.permissions_for(guild.me).send_messages or not channel.permissions_for(guild.me).embed_links:
+            note = f"❌ I don’t have permission to post embeds in {channel.mention}."
+        else:
+            league_id, season, last_week = int(row["league_id"]), int(row["season"]), row["last_week"]
+            # Send with navigator; its state goes to SQLite so the buttons outlive this process
+            view = week_navigator(league_id, season, last_week, row["week"])
+            try:
+                message = await _OUTBOX.send(channel, embeds=_deserialize_page(row["payload"]), view=view)
+                await save_navigator(message.id, guild_id, league_id, season, last_week)
+                status, note = "posted", f"✅ Weekly recap posted in {channel.mention}."
+            except Exception as e:
+                note = f"❌ Couldn’t post the recap in {channel.mention}: `{e}`"
+
+    await close_recap_job(row["job_id"], status, None if status == "posted" else note)
+    # Jobs queued before a restart have no handle; nobody is waiting on a followup
+    handle = _GUILD_JOBS.get(guild_id)
+    if handle is not None and handle.job_id == row["job_id"]:
+        del _GUILD_JOBS[guild_id]
+        handle.followup(note)
+
+async def recap_delivery_loop():
+    """Gateway side: send finished recap jobs for the guilds this process owns."""
+    last_prune = 0.0
+    while True:
+        _RECAP_JOBS_FINISHED.clear()
+        try:
+            rows = await get_finished_recap_jobs(guild_filter=owns_guild)
+            await asyncio.gather(*(_deliver_recap_job(r) for r in rows))
+            _RECAP_JOB_COUNTS.update(await count_recap_jobs())
+            if time.monotonic() - last_prune > 3600:
+                last_prune = time.monotonic()
+                await prune_recap_jobs(RECAP_JOB_RETENTION_SECONDS)
+                await prune_navigators(NAVIGATOR_RETENTION_SECONDS)
+        except Exception as e:
+            print(f"⚠️ Recap delivery error: {e}")
+        try:
+            await asyncio.wait_for(_RECAP_JOBS_FINISHED.wait(), timeout=RECAP_JOB_POLL_SECONDS)
+        except asyncio.TimeoutError:
+            pass
 
 def normalize_weekly_embed_heights(embeds: list[discord.Embed]) -> None:
     """Pad weekly-top embeds so they share the same visual height."""
@@ -389,74 +1198,85 @@ def normalize_weekly_embed_heights(embeds: list[discord.Embed]) -> None:
 @bot.event
 async def on_ready():
     await init_db()
-    await bot.tree.sync()
+    loaded = await load_all_guild_settings(guild_filter=owns_guild)
+    print(f"⚙️ Loaded settings for {loaded} guild(s)")
+    shard_ids = getattr(bot, "shard_ids", None)
+    if shard_ids is None or 0 in shard_ids:
+        await bot.tree.sync()  # commands are global; one process is enough
+    else:
+        print(f"🧩 Running shards {shard_ids} of {bot.shard_count}")
     _ensure_global_workers()   # <--- start workers
     scheduler.start()
     print(f"✅ Logged in as {bot.user}")
 
 def _ensure_global_workers():
-    # Start exactly QUEUE_WORKERS background tasks
-    alive = [t for t in _GLOBAL_WORKERS if not t.done()]
-    missing = max(0, QUEUE_WORKERS - len(alive))
-    for _ in range(missing):
-        _GLOBAL_WORKERS.append(asyncio.create_task(_global_worker()))
+    # Start QUEUE_WORKERS recap builders (none with external workers), SCHEDULED_WORKERS
+    # background tasks, the delivery loop, the live-scoring poller and report delivery
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    builders = 0 if EXTERNAL_RECAP_WORKERS else QUEUE_WORKERS
+    for tasks, count, start in (
+        (_RECAP_BUILDERS, builders, lambda i: recap_builder(f"{worker}/{i}")),
+        (_SCHEDULED_WORKERS, SCHEDULED_WORKERS, lambda i: _global_worker()),
+        (_RECAP_DELIVERY, 1, lambda i: recap_delivery_loop()),
+        (_LIVE_SCORING, 1, lambda i: live_scoring_loop()),
+        (_REPORT_DELIVERY, 1, lambda i: report_delivery_loop()),
+    ):
+        tasks[:] = [t for t in tasks if not t.done()]
+        for _ in range(max(0, count - len(tasks))):
+            tasks.append(asyncio.create_task(start(len(tasks))))
 
 async def _global_worker():
     while True:
-        interaction: discord.Interaction = await _GLOBAL_QUEUE.get()
+        job = await _SCHEDULER.get()
+        token = JOB_PRIORITY.set(job.priority)
+        started = time.monotonic()
+        priority = PRIORITY_NAMES[job.priority]
+        QUEUE_WAIT_SECONDS.observe(started - job.enqueued_at, priority=priority)
+        outcome = "error"
         try:
-            # Per-guild mutex so same guild requests don't overlap
-            async with _GUILD_LOCKS[interaction.guild.id]:
-                await _process_weeklyrecap(interaction)
+            await job.run()
+            outcome = "ok"
         except Exception as e:
             try:
-                await interaction.followup.send(
-                    f"❌ Error while processing queued recap: `{e}`",
-                    ephemeral=True
-                )
+                await job.fail(e)
             except Exception:
                 pass
         finally:
-            _GLOBAL_QUEUE.task_done()
+            JOB_PRIORITY.reset(token)
+            elapsed = time.monotonic() - started
+            JOB_SECONDS.observe(elapsed, priority=priority, outcome=outcome)
 
+async def run_scheduled(jobs: list[ScheduledJob]) -> list:
+    """Queue background jobs at scheduled priority and wait for all of them."""
+    _ensure_global_workers()
+    for job in jobs:
+        await _SCHEDULER.put(job)
+    return await asyncio.gather(*(job.done for job in jobs))
+
+def _fmt_wait(seconds: float) -> str:
+    if seconds < 60:
+        return f"~{max(1, round(seconds))}s"
+    return f"~{round(seconds / 60)} min"
 
+@BUILD_SECONDS.timed(stage="weekly_top")
 async def build_weekly_top_embeds(league: League, week: int, precision: int, starters_only: bool = False) -> list[discord.Embed]:
     """Top player per position for a given week using box scores."""
-    best = {p: None for p in DESIRED_POSITIONS}
-    week_boxes = await espn_call(league.box_scores, week=week)
-
-    for game in week_boxes:
-        for lineup, fteam in ((game.home_lineup, game.home_team), (game.away_lineup, game.away_team)):
-            for bp in lineup:
-                pts = getattr(bp, "points", None)
-                base_pos = getattr(bp, "position", None)
-                slot_pos = getattr(bp, "slot_position", None)
-                if pts is None or base_pos is None:
-                    continue
-                if starters_only and slot_pos == "BE":
-                    continue
-
-                pos = "D/ST" if base_pos in ("DST", "DEF", "Def") else base_pos
-                if pos not in DESIRED_POSITIONS:
-                    if base_pos in DESIRED_POSITIONS:
-                        pos = base_pos
-                    else:
-                        continue
-
-                current = best.get(pos)
-                if current is None or float(pts) > current["points"]:
-                    best[pos] = {
-                        "name": bp.name,
-                        "points": float(pts),
-                        "id": getattr(bp, "playerId", None),
-                        "team": getattr(fteam, "team_name", "Unknown"),
-                    }
+    table = await fetch_week_table(league, week)
+    eligible = table.eligible(starters_only)
 
     embeds: list[discord.Embed] = []
-    for pos in DESIRED_POSITIONS:
-        top = best.get(pos)
-        if not top:
+    for code, pos in enumerate(DESIRED_POSITIONS):
+        mask = (table.pos == code) & eligible
+        if not mask.any():
             continue
+        # argmax keeps the first of equal scores, like a strict > scan
+        i = int(np.argmax(np.where(mask, table.points, -np.inf)))
+        top = {
+            "name": table.names[i],
+            "points": float(table.points[i]),
+            "id": table.player_ids[i],
+            "team": table.teams[i],
+        }
 
         if pos == "D/ST":
             team_key = top["name"].replace(" D/ST", "").strip()
@@ -480,29 +1300,89 @@ async def build_weekly_top_embeds(league: League, week: int, precision: int, sta
 
     return embeds
 
+# ---------- Season-to-date aggregates ----------
+# Running totals per completed week, so week N = week N-1 totals + week N box scores.
+# (league_id, season, starters_only) -> {week: SeasonTotals}
+SEASON_AGG_MAX_LEAGUES = int(os.getenv("SEASON_AGG_MAX_LEAGUES", "256"))
+_SEASON_PREFIXES: OrderedDict[tuple[int, int, bool], dict[int, "SeasonTotals"]] = OrderedDict()
+_SEASON_LOCKS = defaultdict(asyncio.Lock)
+
+class SeasonTotals:
+    """Season-to-date points, one float64 slot per (position, player name) in first-seen order."""
+    __slots__ = ("keys", "names", "pos", "points")
+
+    def __init__(self):
+        self.keys: dict[tuple[int, str], int] = {}
+        self.names: list[str] = []
+        self.pos = np.empty(0, dtype=np.int8)
+        self.points = np.empty(0, dtype=np.float64)
+
+    def copy(self) -> "SeasonTotals":
+        other = SeasonTotals()
+        other.keys = dict(self.keys)
+        other.names = list(self.names)
+        other.pos = self.pos.copy()
+        other.points = self.points.copy()
+        return other
+
+    def add_week(self, table: WeekTable, starters_only: bool) -> None:
+        rows = np.flatnonzero((table.pos >= 0) & table.eligible(starters_only))
+        keys, known, names = self.keys, len(self.keys), table.names
+        ids = [keys.setdefault((code, names[i]), len(keys)) for code, i in zip(table.pos[rows].tolist(), rows.tolist())]
+        if len(keys) > known:
+            new_keys = list(keys)[known:]
+            self.names.extend(name for _, name in new_keys)
+            self.pos = np.concatenate([self.pos, np.array([code for code, _ in new_keys], dtype=np.int8)])
+            self.points = np.concatenate([self.points, np.zeros(len(new_keys))])
+        # bincount also sums a name that shows up twice in one week
+        self.points += np.bincount(ids, weights=table.points[rows], minlength=len(keys))
+
+    def top(self, pos: str, n: int = 5) -> list[tuple[str, float]]:
+        idx = np.flatnonzero(self.pos == DESIRED_POSITIONS.index(pos))
+        # Stable sort keeps first-seen order among equal totals
+        order = idx[np.argsort(-self.points[idx], kind="stable")[:n]]
+        return [(self.names[i], float(self.points[i])) for i in order]
+
+async def season_points_through(league: League, end_week: int, starters_only: bool = False) -> SeasonTotals:
+    """
+    Season-to-date points per position/player through end_week.
+    Starts from the latest stored prefix and folds in only the missing weeks;
+    prefixes are kept only while every week in them is final, so live or
+    pre-correction numbers never get baked into later totals.
+    """
+    league_id, season = _league_key(league)
+    key = (league_id, season, starters_only)
+    async with _SEASON_LOCKS[key]:
+        prefixes = _SEASON_PREFIXES.get(key)
+        if prefixes is None:
+            prefixes = _SEASON_PREFIXES[key] = {}
+            while len(_SEASON_PREFIXES) > SEASON_AGG_MAX_LEAGUES:
+                old_key, _ = _SEASON_PREFIXES.popitem(last=False)
+                _SEASON_LOCKS.pop(old_key, None)
+        _SEASON_PREFIXES.move_to_end(key)
+
+        start = max((wk for wk in prefixes if wk <= end_week), default=0)
+        totals = prefixes[start].copy() if start else SeasonTotals()
+
+        # Fetch the missing weeks concurrently (the ESPN limiter still applies), then fold in order
+        weeks = range(start + 1, end_week + 1)
+        datas = await asyncio.gather(*(_fetch_week(league, wk) for wk in weeks))
+        all_final = True
+        for wk, data in zip(weeks, datas):
+            totals.add_week(_week_table(league, data), starters_only)
+            all_final = all_final and data.final
+            if all_final:
+                prefixes[wk] = totals.copy()
+        return totals
+
+@BUILD_SECONDS.timed(stage="season_top")
 async def build_season_top_embed_combined(league: League, end_week: int, precision: int, starters_only: bool = False) -> discord.Embed:
     """Single embed with Top-5 for each position through end_week."""
-    season_points: dict[str, dict[str, float]] = {p: {} for p in DESIRED_POSITIONS}
-    for wk in range(1, end_week + 1):
-        week_boxes = await espn_call(league.box_scores, week=wk)
-        for game in week_boxes:
-            for lineup in (game.home_lineup, game.away_lineup):
-                for bp in lineup:
-                    pts = getattr(bp, "points", None)
-                    pos = getattr(bp, "position", None)
-                    slot = getattr(bp, "slot_position", None)
-                    if pts is None or pos is None:
-                        continue
-                    if starters_only and slot == "BE":
-                        continue
-                    pos = "D/ST" if pos in ("DST", "DEF", "Def") else pos
-                    if pos not in DESIRED_POSITIONS:
-                        continue
-                    season_points[pos][bp.name] = season_points[pos].get(bp.name, 0.0) + float(pts)
+    season_points = await season_points_through(league, end_week, starters_only)
 
     lines = []
     for pos in DESIRED_POSITIONS:
-        top5 = sorted(season_points[pos].items(), key=lambda x: x[1], reverse=True)[:5]
+        top5 = season_points.top(pos, 5)
         section = "\n".join(f"• **{name}** — {_fmt_points(pts, precision)}" for name, pts in top5) if top5 else "_No data_"
         lines.append(f"**{pos}**\n{section}")
 
@@ -513,8 +1393,9 @@ async def build_season_top_embed_combined(league: League, end_week: int, precisi
         color=0x9b59b6
     )
 
+@BUILD_SECONDS.timed(stage="head_to_head")
 async def build_head_to_head_embed(league: League, week: int, precision: int) -> discord.Embed:
-    box_scores = await espn_call(league.box_scores, week=week)
+    box_scores = await fetch_box_scores(league, week)
     e = Embed(
         title=f"Week {week} Head-to-Head Matchups",
         description="🏈 Weekly fantasy results",
@@ -551,10 +1432,11 @@ async def build_head_to_head_embed(league: League, week: int, precision: int) ->
         e.add_field(name="Matchup", value=result, inline=False)
     return e
 
+@BUILD_SECONDS.timed(stage="power_rankings")
 async def build_power_rankings_embed(league: League, precision: int) -> discord.Embed:
-    teams = await espn_call(lambda: list(league.teams))
+    # league.teams is already loaded; reading it is not an ESPN request
     teams = sorted(
-        teams,
+        league.teams,
         key=lambda t: (-(getattr(t, "wins", 0) or 0), -float(getattr(t, "points_for", 0) or 0.0))
     )
     e = Embed(title="📊 Power Rankings", description="Sorted by Wins, then Points For", color=0x2980b9)
@@ -568,6 +1450,7 @@ async def build_power_rankings_embed(league: League, precision: int) -> discord.
         )
     return e
 
+@BUILD_SECONDS.timed(stage="week_page")
 async def build_week_page(league: League, week: int) -> list[discord.Embed]:
     """One page for a given week, in this order:
        1) Head-to-head, 2) Weekly Top Players, 3) Season Top-5 (combined), 4) Power Rankings."""
@@ -588,57 +1471,322 @@ async def build_week_page(league: League, week: int) -> list[discord.Embed]:
     embeds.append(pr)
     return embeds[:10]  # Discord limit guard
 
+# (league_id, season, week) -> page build in progress, shared by every recap that needs it
+_INFLIGHT_PAGES: dict[tuple[int, int, int], asyncio.Future] = {}
+
+async def build_week_page_shared(league: League, week: int) -> list[discord.Embed]:
+    """build_week_page, coalesced: concurrent requests for the same league week share one build."""
+    key = (*_league_key(league), int(week))
+    fut = _INFLIGHT_PAGES.get(key)
+    CACHE_LOOKUPS.inc(cache="inflight_pages", result="hit" if fut else "miss")
+    if fut is None:
+        fut = asyncio.ensure_future(build_week_page(league, week))
+        _INFLIGHT_PAGES[key] = fut
+        fut.add_done_callback(lambda f: _INFLIGHT_PAGES.pop(key, None) if _INFLIGHT_PAGES.get(key) is f else None)
+    return await asyncio.shield(fut)
+
+async def build_week_pages(league: League, weeks) -> dict[int, list[discord.Embed]]:
+    """
+    Build several week pages concurrently (up to RECAP_FANOUT at once).
+    ESPN calls still queue on the global gate. Returns {week: page} in
+    week order; weeks that fail are skipped.
+    """
+    fanout = asyncio.Semaphore(max(1, RECAP_FANOUT))
+
+    async def build_one(wk: int) -> list[discord.Embed] | None:
+        async with fanout:
+            try:
+                return await build_week_page_shared(league, wk)
+            except Exception as inner_e:
+                print(f"⚠️ Skipping week {wk} due to error: {inner_e}")
+                return None
+
+    weeks = list(weeks)
+    pages = await asyncio.gather(*(build_one(wk) for wk in weeks))
+    return {wk: page for wk, page in zip(weeks, pages) if page}
+
+# ---------- Pre-rendered recap pages ----------
+# ESPN data only moves while games are on. Pages built after the latest scoring
+# window closed are served as-is; older pages are rebuilt live. Stat corrections
+# land days after a window closes, so a page that uses a week still inside its
+# correction window (see _load_week) is only trusted for a short while.
+_ET = ZoneInfo("America/New_York")
+# (weekday, start hour, end hour) in ET, Monday = 0
+SCORING_WINDOWS = [(0, 19, 24), (3, 19, 24), (5, 13, 24), (6, 9, 24)]
+RECAP_ARTIFACT_MAX_AGE_SECONDS = int(os.getenv("RECAP_ARTIFACT_MAX_AGE_SECONDS", "259200"))  # 3 days
+RECAP_UNSETTLED_MAX_AGE_SECONDS = int(os.getenv("RECAP_UNSETTLED_MAX_AGE_SECONDS", "3600"))  # pages with non-final weeks
+
+def _scoring_windows_on(day) -> list[tuple[datetime, datetime]]:
+    return [
+        (datetime.combine(day, dtime(start_hour), tzinfo=_ET),
+         datetime.combine(day, dtime(start_hour), tzinfo=_ET) + timedelta(hours=end_hour - start_hour))
+        for weekday, start_hour, end_hour in SCORING_WINDOWS if day.weekday() == weekday
+    ]
+
+def _open_scoring_window(now: datetime | None = None) -> datetime | None:
+    """Start of the scoring window open right now, if any."""
+    now = now or datetime.now(_ET)
+    for days_back in (0, 1):
+        for start, end in _scoring_windows_on((now - timedelta(days=days_back)).date()):
+            if start <= now < end:
+                return start
+    return None
+
+def _next_scoring_window(now: datetime | None = None) -> datetime:
+    now = now or datetime.now(_ET)
+    for days_ahead in range(8):
+        starts = [start for start, _ in _scoring_windows_on((now + timedelta(days=days_ahead)).date()) if start > now]
+        if starts:
+            return min(starts)
+    return now + timedelta(days=7)
+
+def _last_scoring_change(now: datetime | None = None) -> datetime:
+    """Now if a scoring window is open, otherwise when the latest one closed."""
+    now = now or datetime.now(_ET)
+    latest = None
+    for days_back in range(8):
+        day = (now - timedelta(days=days_back)).date()
+        for weekday, start_hour, end_hour in SCORING_WINDOWS:
+            if day.weekday() != weekday:
+                continue
+            start = datetime.combine(day, dtime(start_hour), tzinfo=_ET)
+            end = start + timedelta(hours=end_hour - start_hour)
+            if start <= now < end:
+                return now
+            if end <= now and (latest is None or end > latest):
+                latest = end
+    return latest or now
+
+def _serialize_page(page: list[discord.Embed]) -> str:
+    return json.dumps([e.to_dict() for e in page])
+
+def _deserialize_page(payload: str) -> list[discord.Embed]:
+    return [Embed.from_dict(d) for d in json.loads(payload)]
+
+async def _settled_weeks(league_id: int, season: int, weeks) -> set[int]:
+    """Weeks whose page only uses final box scores: that week and every one before it."""
+    final = await get_final_box_score_weeks(league_id, season)
+    settled_through = 0
+    while settled_through + 1 in final:
+        settled_through += 1
+    return {wk for wk in weeks if wk <= settled_through}
+
+async def load_fresh_pages(league_id: int, season: int, weeks) -> dict[int, tuple[list[discord.Embed], bool]]:
+    """Pre-rendered pages for the requested weeks that are still fresh, as {week: (page, final)}."""
+    artifacts = await get_recap_artifacts(league_id, season)
+    changed_at = _last_scoring_change().timestamp()
+    now = time.time()
+    pages: dict[int, tuple[list[discord.Embed], bool]] = {}
+    for wk in weeks:
+        artifact = artifacts.get(wk)
+        if not artifact:
+            continue
+        payload, built_at, final = artifact
+        age = now - built_at
+        if built_at >= changed_at and age < RECAP_ARTIFACT_MAX_AGE_SECONDS and (final or age < RECAP_UNSETTLED_MAX_AGE_SECONDS):
+            pages[wk] = (_deserialize_page(payload), final)
+    return pages
+
+async def store_pages(league_id: int, season: int, pages: dict[int, list[discord.Embed]]) -> set[int]:
+    """Store pages as artifacts; returns the weeks among them built from final data only."""
+    if not pages:
+        return set()
+    try:
+        final_weeks = await _settled_weeks(league_id, season, pages)
+        await save_recap_artifacts(
+            league_id, season, {wk: _serialize_page(page) for wk, page in pages.items()}, final_weeks=final_weeks
+        )
+        return final_weeks
+    except Exception as e:
+        print(f"⚠️ Could not store recap pages for league {league_id}: {e}")
+        return set()
+
+async def _prerender_league(candidates: list[dict]) -> int:
+    league_id = candidates[0]["league_id"]
+    for settings in candidates:
+        try:
+            with recap_scope(f"Pre-render for league {league_id}", kind="prerender"):
+                league = await build_league_from_settings(settings)
+                pages = await build_week_pages(league, range(1, _current_week(league) + 1))
+            await store_pages(*_league_key(league), pages)
+            return len(pages)
+        except Exception as e:
+            print(f"⚠️ Pre-render failed for league {league_id}: {e}")
+    return 0
+
+# Shortly after each scoring window closes (Thu/Sat/Sun/Mon nights)
+@scheduler.scheduled_job("cron", day_of_week="fri,sun,mon,tue", hour=0, minute=15)
+async def prerender_recaps():
+    started = time.perf_counter()
+    # Each process pre-renders the leagues of the guilds it owns
+    groups = _group_by_league(await list_guild_settings())
+    counts = await run_scheduled([
+        ScheduledJob(("league", *key), f"Pre-render for league {key[0]}", partial(_prerender_league, candidates))
+        for key, (candidates, _) in groups.items()
+    ])
+    print(f"🗂️ Pre-rendered {sum(counts)} page(s) for {len(groups)} league(s) in {time.perf_counter() - started:.2f}s")
+
 # ---------- Week Navigator ----------
-class WeekNavigator(View):
-    def __init__(self, week_embeds: list[list[discord.Embed]]):
-        super().__init__(timeout=None)
-        self.week_embeds = week_embeds
-        self.index = len(week_embeds) - 1  # start at most recent week
-
-        # Dropdown
-        options = [
-            discord.SelectOption(label=f"Week {i+1}", value=str(i))
-            for i in range(len(week_embeds))
-        ]
-        self.select = Select(placeholder="Jump to week…", min_values=1, max_values=1, options=options)
-        self.select.callback = self.jump_to_week
-        self.add_item(self.select)
-
-        # Set initial disabled state
-        # (button attributes exist thanks to the decorators below)
-        self._update_button_states()
-
-    def _update_button_states(self):
-        # These attributes are created by the decorators (@discord.ui.button)
-        self.previous.disabled = (self.index == 0)
-        self.next.disabled = (self.index == len(self.week_embeds) - 1)
-
-    @discord.ui.button(label="⬅️", style=discord.ButtonStyle.primary)
-    async def previous(self, interaction: discord.Interaction, button: Button):
-        if self.index > 0:
-            self.index -= 1
-        self._update_button_states()
-        await interaction.response.edit_message(embeds=self.week_embeds[self.index], view=self)
-
-    @discord.ui.button(label="➡️", style=discord.ButtonStyle.primary)
-    async def next(self, interaction: discord.Interaction, button: Button):
-        if self.index < len(self.week_embeds) - 1:
-            self.index += 1
-        self._update_button_states()
-        await interaction.response.edit_message(embeds=self.week_embeds[self.index], view=self)
-
-    @discord.ui.button(label="⏹ Reset", style=discord.ButtonStyle.danger)
-    async def reset(self, interaction: discord.Interaction, button: Button):
-        self.index = len(self.week_embeds) - 1
-        self._update_button_states()
-        await interaction.response.edit_message(embeds=self.week_embeds[self.index], view=self)
-
-    async def jump_to_week(self, interaction: discord.Interaction):
-        # value comes in as a string index from the Select
-        self.index = int(self.select.values[0])
-        self._update_button_states()
-        await interaction.response.edit_message(embeds=self.week_embeds[self.index], view=self)
+# Pages shown by navigators, shared across every posted recap and bounded, so a
+# view only holds its league and week. (league_id, season, week) -> (stored_at, page, final)
+NAV_PAGE_CACHE_MAX = int(os.getenv("NAV_PAGE_CACHE_MAX", "128"))
+NAV_PAGE_TTL_SECONDS = int(os.getenv("NAV_PAGE_TTL_SECONDS", "300"))  # reuse even while games are live
+_NAV_PAGES: OrderedDict[tuple[int, int, int], tuple[float, list[discord.Embed], bool]] = OrderedDict()
+
+def _cached_nav_page(key: tuple[int, int, int]) -> list[discord.Embed] | None:
+    entry = _NAV_PAGES.get(key)
+    if entry is None:
+        return None
+    stored_at, page, final = entry
+    now = time.time()
+    # Past the TTL, only pages of final weeks built since the last scoring window are kept
+    if now - stored_at >= NAV_PAGE_TTL_SECONDS and (not final or stored_at < _last_scoring_change().timestamp()):
+        del _NAV_PAGES[key]
+        return None
+    _NAV_PAGES.move_to_end(key)
+    return page
+
+def _remember_nav_page(key: tuple[int, int, int], page: list[discord.Embed], final: bool) -> None:
+    _NAV_PAGES[key] = (time.time(), page, final)
+    _NAV_PAGES.move_to_end(key)
+    while len(_NAV_PAGES) > NAV_PAGE_CACHE_MAX:
+        _NAV_PAGES.popitem(last=False)
+
+async def get_week_page(league: League, week: int) -> list[discord.Embed] | None:
+    """
+    One week's page: the navigator LRU, then a fresh pre-rendered page,
+    then a live build (stored back as an artifact). None if the week is empty.
+    """
+    league_id, season = _league_key(league)
+    key = (league_id, season, int(week))
+    page = _cached_nav_page(key)
+    CACHE_LOOKUPS.inc(cache="nav_pages", result="hit" if page else "miss")
+    if page:
+        return page
+
+    final = False
+    try:
+        page, final = (await load_fresh_pages(league_id, season, [week])).get(week, (None, False))
+    except Exception as e:
+        print(f"⚠️ Could not load pre-rendered page for league {league_id} week {week}: {e}")
+    CACHE_LOOKUPS.inc(cache="page_artifacts", result="hit" if page else "miss")
+    if not page:
+        page = await build_week_page_shared(league, week)
+        if page:
+            final = week in await store_pages(league_id, season, {week: page})
+    if page:
+        _remember_nav_page(key, page, final)
+    return page or None
+
+# Navigator state lives in custom_ids (league, season, week on screen) and in
+# SQLite (guild, last week, keyed by message id). Posted views are stopped, so
+# discord.py keeps nothing per message; clicks reach the dynamic items registered
+# below, which also makes them survive restarts.
+_NAV_ACTIONS = {
+    "prev": ("⬅️", discord.ButtonStyle.primary),
+    "next": ("➡️", discord.ButtonStyle.primary),
+    "reset": ("⏹ Reset", discord.ButtonStyle.danger),
+}
+_NAV_PENDING: dict[int, int] = {}  # message id -> latest click being built
+_NAV_CLICKS = itertools.count(1)
+
+class WeekNavButton(discord.ui.DynamicItem[Button],
+                    template=r"wknav:(?P<action>prev|next|reset):(?P<league_id>\d+):(?P<season>\d+):(?P<week>\d+)"):
+    def __init__(self, action: str, league_id: int, season: int, week: int):
+        label, style = _NAV_ACTIONS[action]
+        super().__init__(Button(label=label, style=style, custom_id=f"wknav:{action}:{league_id}:{season}:{week}"))
+        self.action = action
+        self.league_id = league_id
+        self.season = season
+        self.week = week
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Button, match):
+        return cls(match["action"], int(match["league_id"]), int(match["season"]), int(match["week"]))
+
+    async def callback(self, interaction: discord.Interaction):
+        target = {"prev": self.week - 1, "next": self.week + 1}.get(self.action)  # reset -> last week
+        await navigate_recap(interaction, self.league_id, self.season, target)
+
+class WeekNavSelect(discord.ui.DynamicItem[Select],
+                    template=r"wknav:jump:(?P<league_id>\d+):(?P<season>\d+):(?P<week>\d+)"):
+    def __init__(self, league_id: int, season: int, week: int, options: list[discord.SelectOption]):
+        super().__init__(Select(
+            placeholder="Jump to week…", min_values=1, max_values=1, options=options,
+            custom_id=f"wknav:jump:{league_id}:{season}:{week}",
+        ))
+        self.league_id = league_id
+        self.season = season
+
+    @classmethod
+    async def from_custom_id(cls, interaction: discord.Interaction, item: Select, match):
+        return cls(int(match["league_id"]), int(match["season"]), int(match["week"]), item.options)
+
+    async def callback(self, interaction: discord.Interaction):
+        # value comes in as a string week number from the Select
+        await navigate_recap(interaction, self.league_id, self.season, int(self.item.values[0]))
+
+bot.add_dynamic_items(WeekNavButton, WeekNavSelect)
+
+def week_navigator(league_id: int, season: int, last_week: int, week: int) -> View:
+    """Prev/next/reset buttons and a week picker, rendered for `week`."""
+    view = View(timeout=None)
+    for action in _NAV_ACTIONS:
+        button = WeekNavButton(action, league_id, season, week)
+        button.item.disabled = (action == "prev" and week <= 1) or (action == "next" and week >= last_week)
+        view.add_item(button)
+    # Dropdown (Discord allows 25 options; keep the most recent weeks)
+    options = [
+        discord.SelectOption(label=f"Week {wk}", value=str(wk))
+        for wk in range(max(1, last_week - 24), last_week + 1)
+    ]
+    view.add_item(WeekNavSelect(league_id, season, week, options))
+    view.stop()  # render only; clicks go through the dynamic items
+    return view
+
+async def navigate_recap(interaction: discord.Interaction, league_id: int, season: int, week: int | None):
+    """Show `week` (None = most recent) on the recap message the click came from."""
+    message_id = interaction.message.id
+    state = await get_navigator(message_id)
+    if state is None:
+        await interaction.response.send_message(
+            "⌛ This recap can’t be browsed anymore. Run `/weeklyrecap` for a fresh one.", ephemeral=True
+        )
+        return
+    last_week = max(1, state["last_week"])
+    week = last_week if week is None else max(1, min(last_week, week))
 
+    page = _cached_nav_page((league_id, season, week))
+    if page:
+        _NAV_PENDING.pop(message_id, None)
+        await interaction.response.edit_message(embeds=page, view=week_navigator(league_id, season, last_week, week))
+        return
+
+    # Building can outlast Discord's 3s window, so acknowledge first and edit after
+    await interaction.response.defer()
+    request = _NAV_PENDING[message_id] = next(_NAV_CLICKS)
+    try:
+        settings = await get_guild_settings(state["guild_id"])
+        if not settings:
+            await interaction.followup.send("❌ This server isn’t set up anymore. Use `/setup` first.", ephemeral=True)
+            return
+        try:
+            with recap_scope(f"Week {week} for league {league_id}", kind="navigator"):
+                # The message's league, with the server's current credentials
+                league = await build_league_from_settings({**settings, "league_id": league_id, "season": season})
+                page = await get_week_page(league, week)
+        except Exception as e:
+            await interaction.followup.send(f"❌ Couldn’t load week {week}: `{e}`", ephemeral=True)
+            return
+        if not page:
+            await interaction.followup.send(f"🤷 No data available for week {week} yet.", ephemeral=True)
+            return
+        if _NAV_PENDING.get(message_id) != request:
+            return  # a later click already moved on
+        await interaction.edit_original_response(embeds=page, view=week_navigator(league_id, season, last_week, week))
+    finally:
+        if _NAV_PENDING.get(message_id) == request:
+            del _NAV_PENDING[message_id]
 
 # ---------- Commands ----------
 
@@ -663,10 +1811,9 @@ async def setup(
     await interaction.response.defer(ephemeral=True)
     # Validate cookies/league up front so we don't save bad creds
     try:
-        test_league = await espn_call(
+        await espn_call(
             League, league_id=int(league_id), year=int(season), swid=swid, espn_s2=espn_s2
         )
-        _ = await espn_call(lambda: list(test_league.teams))
     except Exception as e:
         await interaction.followup.send(
             "❌ Those cookies don’t grant access to this league. "
@@ -740,11 +1887,10 @@ async def feedback_cmd(
     message: str,
     category: app_commands.Choice[str] | None = None
 ):
-    await interaction.response.defer(ephemeral=True)
-
+    # Nothing here waits on I/O, so answer directly instead of deferring
     msg = (message or "").strip()
     if not (1 <= len(msg) <= 1000):
-        await interaction.followup.send("❌ Please keep feedback between 1 and 1000 characters.", ephemeral=True)
+        await interaction.response.send_message("❌ Please keep feedback between 1 and 1000 characters.", ephemeral=True)
         return
 
     tag = category.value if category else "general"
@@ -770,10 +1916,11 @@ async def feedback_cmd(
     gh_url = _github_issue_url(gh_title, gh_body)
     jump_url = f"https://discord.com/channels/{interaction.guild.id}/{interaction.channel.id}"
 
-    # Always send to your HOME_FEEDBACK_WEBHOOK_URL
-    _ = await send_to_home_webhook("feedback", e, gh_url, jump_url)
+    # Always send to your HOME_FEEDBACK_WEBHOOK_URL (delivered in the background)
+    queue_home_report("feedback", e, gh_url, jump_url)
+    _ensure_global_workers()
 
-    await interaction.followup.send("✅ Thanks! Your feedback was submitted.", ephemeral=True)
+    await interaction.response.send_message("✅ Thanks! Your feedback was submitted.", ephemeral=True)
 
 @app_commands.guild_only()
 @app_checks.cooldown(2, 60.0)  # per-user cooldown
@@ -795,15 +1942,14 @@ async def bugreport_cmd(
     details: str,
     severity: app_commands.Choice[str] | None = None
 ):
-    await interaction.response.defer(ephemeral=True)
-
+    # Nothing here waits on I/O, so answer directly instead of deferring
     t = (title or "").strip()
     d = (details or "").strip()
     if not (3 <= len(t) <= 120):
-        await interaction.followup.send("❌ Title must be 3–120 characters.", ephemeral=True)
+        await interaction.response.send_message("❌ Title must be 3–120 characters.", ephemeral=True)
         return
     if not (5 <= len(d) <= 1500):
-        await interaction.followup.send("❌ Details must be 5–1500 characters.", ephemeral=True)
+        await interaction.response.send_message("❌ Details must be 5–1500 characters.", ephemeral=True)
         return
 
     sev = severity.value if severity else "medium"
@@ -828,10 +1974,11 @@ async def bugreport_cmd(
     gh_url = _github_issue_url(gh_title, gh_body)
     jump_url = f"https://discord.com/channels/{interaction.guild.id}/{interaction.channel.id}"
 
-    # Always send to your HOME_BUGS_WEBHOOK_URL
-    _ = await send_to_home_webhook("bug", e, gh_url, jump_url)
+    # Always send to your HOME_BUGS_WEBHOOK_URL (delivered in the background)
+    queue_home_report("bug", e, gh_url, jump_url)
+    _ensure_global_workers()
 
-    await interaction.followup.send("✅ Thanks! Your bug has been reported.", ephemeral=True)
+    await interaction.response.send_message("✅ Thanks! Your bug has been reported.", ephemeral=True)
 
 @app_commands.guild_only()
 @app_commands.default_permissions(manage_guild=True)
@@ -851,6 +1998,26 @@ async def autopost(interaction: discord.Interaction, enabled: bool):
     )
     await interaction.followup.send(msg, ephemeral=True)
 
+@app_commands.guild_only()
+@app_commands.default_permissions(manage_guild=True)
+@bot.tree.command(name="livescores", description="Enable or disable a live scoreboard during games")
+@app_commands.describe(enabled="Set to true to enable, false to disable")
+async def livescores(interaction: discord.Interaction, enabled: bool):
+    await interaction.response.defer(ephemeral=True)
+    settings = await get_guild_settings(str(interaction.guild.id))
+    if not settings:
+        await interaction.followup.send("❌ This server hasn't been set up. Use `/setup` first.", ephemeral=True)
+        return
+
+    # Keep the existing scoreboard message when re-enabling
+    await set_live_scoring(str(interaction.guild.id), enabled, settings.get("live_message_id") if enabled else None)
+    _ensure_global_workers()
+    msg = (
+        f"✅ Live scores enabled! During games I’ll keep one pinned scoreboard in <#{settings['channel_id']}> up to date."
+        if enabled else "❌ Live scores disabled."
+    )
+    await interaction.followup.send(msg, ephemeral=True)
+
 @app_commands.guild_only()
 @bot.tree.command(name="show_settings", description="Show saved league settings for this server (admin only).")
 @app_commands.default_permissions(manage_guild=True)
@@ -864,7 +2031,8 @@ async def show_settings(interaction: discord.Interaction):
         f"League ID: {s['league_id']}\n"
         f"Season: {s['season']}\n"
         f"Channel: <#{s['channel_id']}>\n"
-        f"Autopost: {'Enabled' if s.get('autopost_enabled') else 'Disabled'}"
+        f"Autopost: {'Enabled' if s.get('autopost_enabled') else 'Disabled'}\n"
+        f"Live scores: {'Enabled' if s.get('live_enabled') else 'Disabled'}"
     )
     await interaction.followup.send(msg, ephemeral=True)
 
@@ -891,48 +2059,291 @@ async def weeklyrecap_slash(interaction: discord.Interaction):
         )
         return
 
-    position = _GLOBAL_QUEUE.qsize() + 1
-    await _GLOBAL_QUEUE.put(interaction)
+    # One unfinished job per guild: a repeat request rides along with it
+    job_id, created = await enqueue_recap_job(interaction.guild.id, channel.id)
+    job = _GUILD_JOBS.get(interaction.guild.id)
+    if job is None or job.job_id != job_id:
+        job = _GUILD_JOBS[interaction.guild.id] = RecapJob(interaction.guild.id, job_id)
+    job.interactions.append(interaction)
+    if not created:
+        await interaction.followup.send(
+            f"🧾 A weekly recap for this server is already on its way. "
+            f"I’ll let you know when it’s posted in {channel.mention}.",
+            ephemeral=True
+        )
+        return
+    _RECAP_JOBS_QUEUED.set()
     _ensure_global_workers()
 
-    note = f" (processing up to {QUEUE_WORKERS} at a time)" if QUEUE_WORKERS > 1 else ""
+    builders = RECAP_WORKER_PROCESSES * QUEUE_WORKERS if EXTERNAL_RECAP_WORKERS else QUEUE_WORKERS
+    # Running count first: a builder claiming in between then shows up as position 0
+    running = (await count_recap_jobs())["running"]
+    position = await recap_job_position(job_id)
+    if position and position + running > builders:
+        note = f" (processing up to {builders} at a time)" if builders > 1 else ""
+        eta = _fmt_wait(math.ceil(position / max(1, builders)) * _RECAP_JOB_AVG_SECONDS)
+        status = f"🧾 You are **#{position}** in the global queue{note}, estimated wait {eta}. "
+    else:
+        status = "🧾 Your recap is being built now. "
     await interaction.followup.send(
-        f"🧾 You are **#{position}** in the global queue{note}. "
-        f"I’ll post the weekly recap in {channel.mention} when it’s ready.",
+        f"{status}I’ll post the weekly recap in {channel.mention} when it’s ready.",
         ephemeral=True
     )
 
 # ---------- Scheduler (auto-post Tuesdays 11:00 AM ET) ----------
+
+async def _autopost_league(candidates: list[dict], targets: list[tuple[discord.Guild, discord.abc.Messageable]], started: float):
+    """Build one league's current-week page once and send it to every subscribed channel."""
+    league_id = candidates[0]["league_id"]
+    page, week, build_error = None, None, None
+    with recap_scope(f"Auto-post for league {league_id} ({len(targets)} guild(s))", kind="autopost"):
+        for settings in candidates:
+            try:
+                league = await build_league_from_settings(settings)
+                week = _current_week(league)
+                page = await build_week_page_shared(league, week)
+                build_error = None
+                break
+            except Exception as e:
+                build_error = e
+    if build_error is not None:
+        for guild, _ in targets:
+            print(f"❌ Auto-post failed for guild {guild.id}: {build_error}")
+        return
+
+    # Queue every channel at once; the outbox spaces them out under Discord's limits
+    sends = [
+        _OUTBOX.send(channel, content=f"🤷 No data available for week {week} yet.") if not page
+        else _OUTBOX.send(channel, embeds=page)
+        for _, channel in targets
+    ]
+    for (guild, _), result in zip(targets, await asyncio.gather(*sends, return_exceptions=True)):
+        if isinstance(result, Exception):
+            print(f"❌ Auto-post failed for guild {guild.id}: {result}")
+        else:
+            print(f"📬 Auto-post for guild {guild.id} (league {league_id}) sent after {time.perf_counter() - started:.2f}s")
+
 @scheduler.scheduled_job("cron", day_of_week="tue", hour=11, minute=0)
 async def auto_post_weekly_recap():
-    for guild in bot.guilds:
-        try:
-            settings = await get_guild_settings(str(guild.id))
-            if not settings or not settings.get("autopost_enabled") or not settings.get("channel_id"):
-                continue
+    started = time.perf_counter()
+    try:
+        subscribed = await get_autopost_guild_settings()
+    except Exception as e:
+        print(f"❌ Auto-post could not load subscribed guilds: {e}")
+        return
 
-            channel = guild.get_channel(int(settings["channel_id"]))
-            if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+    # One build per league; guilds owned by another shard process are posted there
+    groups: dict[tuple[int, int], tuple[list[dict], list[tuple]]] = {}
+    for key, (candidates, guilds) in _group_by_league(subscribed).items():
+        targets = []
+        for settings in guilds:
+            guild = bot.get_guild(settings["guild_id"])
+            if guild is None or not settings.get("channel_id"):
                 continue
+            channel = guild.get_channel(int(settings["channel_id"]))
+            if isinstance(channel, (discord.TextChannel, discord.Thread)):
+                targets.append((guild, channel))
+        if targets:
+            groups[key] = (candidates, targets)
+
+    # Leagues run concurrently on the SCHEDULED_WORKERS pool
+    await run_scheduled([
+        ScheduledJob(
+            ("league", *key), f"Auto-post for league {key[0]}",
+            partial(_autopost_league, candidates, targets, started)
+        )
+        for key, (candidates, targets) in groups.items()
+    ])
+    print(
+        f"✅ Auto-post finished: {sum(len(targets) for _, targets in groups.values())} guild(s), "
+        f"{len(groups)} league(s) in {time.perf_counter() - started:.2f}s"
+    )
 
-            league = await build_league_from_settings(settings)
-            week = (
-                int(getattr(league, "current_week", 0) or 0)
-                or int(getattr(league, "nfl_week", 0) or 0)
-                or 1
+# ---------- Live scoring ----------
+# Opt-in per guild (/livescores). While a scoring window is open, each league's
+# current matchups are polled and one pinned message per guild is edited in place.
+# Polls are conditional (ETag, else a body hash), and a league's interval grows
+# while its scores sit still and drops back to the minimum when they move.
+LIVE_POLL_MIN_SECONDS = int(os.getenv("LIVE_POLL_MIN_SECONDS", "60"))
+LIVE_POLL_MAX_SECONDS = int(os.getenv("LIVE_POLL_MAX_SECONDS", "600"))
+LIVE_POLL_BACKOFF = 1.5
+
+class LiveLeague:
+    """Polling state for one league season: the last scores snapshot and when to poll next."""
+    __slots__ = ("window", "week", "matchup_period", "team_names", "etag", "scores", "deltas", "interval", "next_poll")
+
+    def __init__(self):
+        self.window: datetime | None = None  # window the week and team names were read in
+        self.week = 1
+        self.matchup_period = 1
+        self.team_names: dict[int, str] = {}
+        self.etag: str | None = None
+        self.scores: dict[tuple[int, int], tuple[float, float]] = {}  # (home id, away id) -> scores
+        self.deltas: dict[tuple[int, int], tuple[float, float]] = {}  # change since the previous snapshot
+        self.interval = LIVE_POLL_MIN_SECONDS
+        self.next_poll = 0.0
+
+# (league_id, season) -> state, for leagues with live scoring on in guilds this process owns
+_LIVE_LEAGUES: dict[tuple[int, int], LiveLeague] = {}
+
+async def _poll_live_league(key: tuple[int, int], state: LiveLeague, candidates: list[dict], window: datetime) -> bool:
+    """One conditional poll of the current matchups; True if any score moved."""
+    league_id, season = key
+    error = None
+    for settings in candidates:
+        creds = {"swid": settings["swid"], "espn_s2": settings["espn_s2"]}
+        try:
+            if state.window != window:
+                # Week and team names once per window, not on every poll
+                info = await espn_call_async(_ESPN_CLIENT.fetch_league_state, league_id, season, **creds)
+                state.week = info["current_week"] or 1
+                state.matchup_period = info["current_matchup_period"] or state.week
+                state.team_names = {t["team_id"]: t["team_name"] for t in info["teams"]}
+                state.window, state.etag = window, None
+            games, state.etag = await espn_call_async(
+                _ESPN_CLIENT.fetch_live_scores, league_id, season, state.week, state.matchup_period, state.etag, **creds
             )
-            if week < 1:
-                week = 1
+            break
+        except Exception as e:
+            error = e
+    else:
+        raise error
 
-            page = await build_week_page(league, week)
-            if not page:
-                await channel.send(f"🤷 No data available for week {week} yet.")
-            else:
-                await channel.send(embeds=page)
+    if games is None:
+        return False
+    scores = {(g[1], g[4]): (g[3], g[6]) for g in games}
+    if scores == state.scores:
+        return False
+    previous = state.scores
+    state.deltas = {
+        k: (home - previous[k][0], away - previous[k][1]) for k, (home, away) in scores.items() if k in previous
+    }
+    state.scores = scores
+    return True
+
+def _fmt_delta(delta: float, precision: int) -> str:
+    if abs(delta) < 0.005:
+        return ""
+    return f" ({'+' if delta > 0 else '−'}{_fmt_points(abs(delta), precision)})"
+
+def build_live_scores_embed(state: LiveLeague, precision: int) -> discord.Embed:
+    e = Embed(title=f"🔴 Live Scores — Week {state.week}", color=0xe74c3c, timestamp=datetime.now(_ET))
+    for (home_id, away_id), (home_score, away_score) in state.scores.items():
+        home_delta, away_delta = state.deltas.get((home_id, away_id), (0.0, 0.0))
+        home = state.team_names.get(home_id, "Unknown")
+        if not away_id:
+            e.add_field(name=f"{home} (bye)", value=_fmt_points(home_score, precision), inline=False)
+            continue
+        away = state.team_names.get(away_id, "Unknown")
+        e.add_field(
+            name=f"{home} vs {away}",
+            value=(
+                f"**{_fmt_points(home_score, precision)}**{_fmt_delta(home_delta, precision)}"
+                f" - **{_fmt_points(away_score, precision)}**{_fmt_delta(away_delta, precision)}"
+            ),
+            inline=False
+        )
+    e.set_footer(text="Changes since the previous update in brackets")
+    return e
 
+async def _publish_live_scores(settings: dict, embed: discord.Embed):
+    """Edit the guild's pinned scoreboard, or post and pin a new one."""
+    guild = bot.get_guild(settings["guild_id"])
+    channel = guild.get_channel(int(settings["channel_id"])) if guild and settings.get("channel_id") else None
+    if not isinstance(channel, (discord.TextChannel, discord.Thread)):
+        return
+    message_id = settings.get("live_message_id")
+    if message_id:
+        try:
+            await _OUTBOX.edit(channel.get_partial_message(message_id), target="live_edit", embed=embed)
+            return
+        except discord.NotFound:
+            pass  # deleted, or the channel changed; post a fresh one
+    message = await _OUTBOX.send(channel, embed=embed)
+    try:
+        await message.pin(reason="Live scores")
+    except discord.HTTPException:
+        pass  # still edited in place without Manage Messages
+    # Only the message id: /livescores false may have run while this tick was in flight
+    await set_live_message(settings["guild_id"], message.id)
+
+async def _update_live_league(key: tuple[int, int], candidates: list[dict], guilds: list[dict], window: datetime):
+    state = _LIVE_LEAGUES[key]
+    token = JOB_PRIORITY.set(PRIORITY_SCHEDULED)
+    try:
+        changed = await _poll_live_league(key, state, candidates, window)
+    except Exception as e:
+        print(f"⚠️ Live poll failed for league {key[0]}: {e}")
+        changed = False
+    finally:
+        JOB_PRIORITY.reset(token)
+    state.interval = LIVE_POLL_MIN_SECONDS if changed else min(LIVE_POLL_MAX_SECONDS, state.interval * LIVE_POLL_BACKOFF)
+    state.next_poll = time.monotonic() + state.interval
+
+    # Every guild when scores moved; otherwise only guilds that have no scoreboard yet
+    targets = guilds if changed else [s for s in guilds if not s.get("live_message_id")]
+    if not targets or not state.scores:
+        return
+    precision = _PRECISION_CACHE.get(key)
+    if precision is None:
+        try:
+            precision = await get_league_precision(*key)
+        except Exception:
+            precision = None
+    embed = build_live_scores_embed(state, 2 if precision is None else precision)
+    for settings, result in zip(targets, await asyncio.gather(
+        *(_publish_live_scores(s, embed) for s in targets), return_exceptions=True
+    )):
+        if isinstance(result, Exception):
+            print(f"⚠️ Live scores update failed for guild {settings['guild_id']}: {result}")
+
+async def _live_scoring_tick(window: datetime):
+    groups = _group_by_league(await list_guild_settings(), live=True)
+    for key in [k for k in _LIVE_LEAGUES if k not in groups]:
+        del _LIVE_LEAGUES[key]
+    now = time.monotonic()
+    due = [key for key in groups if _LIVE_LEAGUES.setdefault(key, LiveLeague()).next_poll <= now]
+    await asyncio.gather(*(_update_live_league(key, *groups[key], window) for key in due))
+
+async def live_scoring_loop():
+    """Poll live leagues while a scoring window is open; sleep through the rest of the week."""
+    while True:
+        now = datetime.now(_ET)
+        window = _open_scoring_window(now)
+        if window is None:
+            _LIVE_LEAGUES.clear()
+            # Wake at the next window (re-checking every 15 minutes)
+            await asyncio.sleep(min(900, max(1, (_next_scoring_window(now) - now).total_seconds())))
+            continue
+        try:
+            await _live_scoring_tick(window)
         except Exception as e:
-            print(f"❌ Auto-post failed for guild {guild.id}: {e}")
+            print(f"⚠️ Live scoring error: {e}")
+        # Newly enabled guilds are picked up within LIVE_POLL_MIN_SECONDS
+        next_poll = min((s.next_poll for s in _LIVE_LEAGUES.values()), default=float("inf"))
+        await asyncio.sleep(min(LIVE_POLL_MIN_SECONDS, max(1, next_poll - time.monotonic())))
+
+# ---------- Metrics ----------
+def _cache_hit_ratios() -> dict[tuple[str], float]:
+    ratios = {("settings",): get_settings_cache_stats()["hit_ratio"]}
+    for cache in ("box_score_memo", "box_score_sqlite", "league_pool", "page_artifacts", "inflight_pages", "nav_pages", "precision"):
+        ratios[(cache,)] = hit_ratio(cache)
+    return ratios
+
+CACHE_HIT_RATIO.set_function(_cache_hit_ratios)
 
 # ---------- Entrypoint ----------
+async def main():
+    async with bot:
+        metrics_runner = await start_metrics_server()
+        try:
+            await bot.start(get_discord_bot_token())
+        finally:
+            await stop_metrics_server(metrics_runner)
+            await close_home_reports()
+            await _OUTBOX.close()
+            await _ESPN_CLIENT.close()
+            await close_db()
+
 if __name__ == "__main__":
-    asyncio.run(bot.start(get_discord_bot_token()))
+    asyncio.run(main())
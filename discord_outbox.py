@@ -0,0 +1,138 @@
+# discord_outbox.py
+import asyncio
+import time
+from collections import OrderedDict, deque
+import discord
+from espn_limiter import TokenBucket
+from metrics import DISCORD_SEND_SECONDS, DISCORD_OUTBOX_WAIT_SECONDS
+
+
+class _Outgoing:
+    __slots__ = ("make", "target", "global_limit", "merge_key", "lines", "future", "enqueued_at")
+
+    def __init__(self, make, target: str, global_limit: bool, merge_key=None):
+        self.make = make
+        self.target = target
+        self.global_limit = global_limit
+        self.merge_key = merge_key
+        self.lines: list[str] = []
+        self.future: asyncio.Future = asyncio.get_running_loop().create_future()
+        # Fire-and-forget callers never read the result; don't warn about unretrieved errors
+        self.future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.enqueued_at = time.monotonic()
+
+
+class Outbox:
+    """
+    Paces outbound Discord requests ahead of time instead of finding the
+    limits through 429s.
+      - one FIFO per route key (a channel, or a guild's interaction followups),
+        drained by a task that only exists while the FIFO has work
+      - a token bucket per route key plus one shared by every channel request
+      - ephemeral followups still queued for the same interaction are merged
+        into one message
+    Every call returns a future for the Discord result (a Message for sends).
+    """
+    def __init__(self, global_rate: float, route_rate: float, route_burst: int, max_routes: int = 4096):
+        self.global_bucket = TokenBucket(global_rate, max(1, int(global_rate)))
+        self.route_rate = route_rate
+        self.route_burst = route_burst
+        self.max_routes = max_routes
+        self._queues: dict[object, deque] = {}
+        self._drainers: dict[object, asyncio.Task] = {}
+        # LRU: a route that drops out has been idle long enough to have a full bucket again
+        self._buckets: OrderedDict[object, TokenBucket] = OrderedDict()
+
+    @property
+    def depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def send(self, channel: discord.abc.Messageable, **kwargs) -> asyncio.Future:
+        return self.submit(("channel", channel.id), lambda: channel.send(**kwargs), "channel")
+
+    def edit(self, message: discord.PartialMessage, target: str = "edit", **kwargs) -> asyncio.Future:
+        return self.submit(("channel", message.channel.id), lambda: message.edit(**kwargs), target)
+
+    def followup(self, interaction: discord.Interaction, content: str) -> asyncio.Future:
+        """Ephemeral followup; joins one still queued for the same interaction."""
+        key = ("followup", interaction.guild_id or interaction.id)
+        for item in self._queues.get(key, ()):
+            if item.merge_key == interaction.id:
+                item.lines.append(content)
+                return item.future
+        item = _Outgoing(None, "followup", global_limit=False, merge_key=interaction.id)
+        item.lines.append(content)
+        item.make = lambda: interaction.followup.send("\n".join(item.lines), ephemeral=True)
+        return self._enqueue(key, item)
+
+    def submit(self, key, make_awaitable, target: str, global_limit: bool = True) -> asyncio.Future:
+        """Queue make_awaitable() on route `key`; it's called once the route and global buckets allow."""
+        return self._enqueue(key, _Outgoing(make_awaitable, target, global_limit))
+
+    def _enqueue(self, key, item: _Outgoing) -> asyncio.Future:
+        self._queues.setdefault(key, deque()).append(item)
+        if key not in self._drainers:
+            self._drainers[key] = asyncio.create_task(self._drain(key))
+        return item.future
+
+    def _bucket(self, key) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = TokenBucket(self.route_rate, self.route_burst)
+            while len(self._buckets) > self.max_routes:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+        return bucket
+
+    async def _drain(self, key):
+        queue = self._queues[key]
+        try:
+            while queue:
+                item = queue[0]
+                await self._bucket(key).take()
+                if item.global_limit:
+                    await self.global_bucket.take()
+                # Leave it queued while waiting so more followups can merge into it
+                queue.popleft()
+                DISCORD_OUTBOX_WAIT_SECONDS.observe(time.monotonic() - item.enqueued_at, target=item.target)
+                try:
+                    with DISCORD_SEND_SECONDS.time(target=item.target):
+                        result = await self._call(item)
+                except Exception as e:
+                    if not item.future.done():
+                        item.future.set_exception(e)
+                else:
+                    if not item.future.done():
+                        item.future.set_result(result)
+        except asyncio.CancelledError:
+            for pending in (item, *queue):
+                pending.future.cancel()
+            raise
+        finally:
+            del self._queues[key]
+            del self._drainers[key]
+
+    @staticmethod
+    async def _call(item: _Outgoing):
+        # discord.py retries 429s itself; one that still gets through waits out retry_after once more
+        try:
+            return await item.make()
+        except discord.HTTPException as e:
+            if e.status != 429:
+                raise
+            await asyncio.sleep(float(getattr(e, "retry_after", 0) or 1))
+            return await item.make()
+
+    async def close(self):
+        """Cancel pending requests (shutdown)."""
+        drainers = list(self._drainers.values())
+        for task in drainers:
+            task.cancel()
+        await asyncio.gather(*drainers, return_exceptions=True)
+        # Drainers cancelled before their first step never ran their cleanup
+        for queue in self._queues.values():
+            for item in queue:
+                item.future.cancel()
+        self._queues.clear()
+        self._drainers.clear()
@@ -0,0 +1,230 @@
+# espn_client.py
+import hashlib
+import json
+import os
+import aiohttp
+from dotenv import load_dotenv
+from espn_api.football.constant import POSITION_MAP
+
+load_dotenv()
+
+# Base for league endpoints; override to point at a local stub server
+ESPN_API_BASE = os.getenv("ESPN_API_BASE", "https://lm-api-reads.fantasy.espn.com/apis/v3/games/ffl")
+ESPN_HTTP_LIMIT_PER_HOST = int(os.getenv("ESPN_HTTP_LIMIT_PER_HOST", "8"))
+ESPN_HTTP_KEEPALIVE_SECONDS = int(os.getenv("ESPN_HTTP_KEEPALIVE_SECONDS", "60"))
+
+
+class EspnHTTPError(Exception):
+    def __init__(self, status: int, url: str):
+        super().__init__(f"ESPN returned an HTTP {status}")
+        self.status = status
+        self.url = url
+
+
+class EspnClient:
+    """
+    Async reader for the ESPN fantasy league endpoints over one shared,
+    keep-alive aiohttp session. Returns the same normalized rows that
+    settings_manager stores for box scores, so the bot can rebuild the
+    objects its embed builders expect.
+    """
+    def __init__(self, base_url: str = ESPN_API_BASE, limit_per_host: int = ESPN_HTTP_LIMIT_PER_HOST):
+        self.base_url = base_url.rstrip("/")
+        self.limit_per_host = limit_per_host
+        self._session: aiohttp.ClientSession | None = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=ESPN_HTTP_KEEPALIVE_SECONDS,
+            )
+            # Cookies differ per league, so they go on each request instead of a shared jar
+            self._session = aiohttp.ClientSession(connector=connector, cookie_jar=aiohttp.DummyCookieJar())
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _league_request(self, league_id: int, season: int, views: list[str],
+                        scoring_period: int | None, fantasy_filter: dict | None,
+                        swid: str | None, espn_s2: str | None):
+        url = f"{self.base_url}/seasons/{int(season)}/segments/0/leagues/{int(league_id)}"
+        params = [("view", v) for v in views]
+        if scoring_period is not None:
+            params.append(("scoringPeriodId", str(int(scoring_period))))
+        headers = {}
+        if fantasy_filter:
+            headers["x-fantasy-filter"] = json.dumps(fantasy_filter)
+        if swid and espn_s2:
+            headers["Cookie"] = f"espn_s2={espn_s2}; SWID={swid}"
+        return url, params, headers
+
+    async def league_get(self, league_id: int, season: int, views: list[str], *,
+                         scoring_period: int | None = None, fantasy_filter: dict | None = None,
+                         swid: str | None = None, espn_s2: str | None = None) -> dict:
+        url, params, headers = self._league_request(
+            league_id, season, views, scoring_period, fantasy_filter, swid, espn_s2
+        )
+        async with self._get_session().get(url, params=params, headers=headers) as resp:
+            if resp.status != 200:
+                raise EspnHTTPError(resp.status, str(resp.url))
+            data = await resp.json(content_type=None)
+        return data[0] if isinstance(data, list) else data
+
+    async def league_get_if_changed(self, league_id: int, season: int, views: list[str], *,
+                                    etag: str | None = None, scoring_period: int | None = None,
+                                    fantasy_filter: dict | None = None, swid: str | None = None,
+                                    espn_s2: str | None = None) -> tuple[dict | None, str | None]:
+        """
+        Conditional league_get: (None, etag) when nothing changed since `etag`,
+        else (data, new etag). Uses ESPN's ETag when it sends one (304s skip the
+        body), otherwise a hash of the body, so unchanged data is never re-parsed.
+        """
+        url, params, headers = self._league_request(
+            league_id, season, views, scoring_period, fantasy_filter, swid, espn_s2
+        )
+        if etag and not etag.startswith("sha1:"):
+            headers["If-None-Match"] = etag
+        async with self._get_session().get(url, params=params, headers=headers) as resp:
+            if resp.status == 304:
+                return None, etag
+            if resp.status != 200:
+                raise EspnHTTPError(resp.status, str(resp.url))
+            body = await resp.read()
+            new_etag = resp.headers.get("ETag") or f"sha1:{hashlib.sha1(body).hexdigest()}"
+        if new_etag == etag:
+            return None, etag
+        data = json.loads(body)
+        return (data[0] if isinstance(data, list) else data), new_etag
+
+    async def fetch_league_state(self, league_id: int, season: int, **creds) -> dict:
+        """Current week plus each team's name, record and points, from the mTeam view."""
+        data = await self.league_get(league_id, season, ["mTeam"], **creds)
+        status = data.get("status", {})
+        current_week = data.get("scoringPeriodId", 0)
+        final_week = status.get("finalScoringPeriod")
+        if final_week and current_week > final_week:
+            current_week = final_week
+
+        teams = []
+        for t in data.get("teams", []):
+            overall = t.get("record", {}).get("overall", {})
+            name = t.get("name") or f"{t.get('location', '')} {t.get('nickname', '')}".strip()
+            teams.append({
+                "team_id": t.get("id"),
+                "team_name": name or "Unknown",
+                "wins": overall.get("wins", 0),
+                "losses": overall.get("losses", 0),
+                "points_for": overall.get("pointsFor", 0),
+                "points_against": overall.get("pointsAgainst", 0),
+            })
+        return {
+            "current_week": current_week,
+            "nfl_week": status.get("latestScoringPeriod", current_week),
+            "current_matchup_period": status.get("currentMatchupPeriod", current_week),
+            "teams": teams,
+        }
+
+    async def fetch_box_score_rows(self, league_id: int, season: int, week: int,
+                                   matchup_period: int | None = None, team_names: dict | None = None,
+                                   **creds) -> tuple[list[tuple], list[tuple]]:
+        """
+        One request (mMatchupScore + mScoreboard) for a week's matchups.
+        Returns (games, players) rows in settings_manager's box-score layout.
+        """
+        matchup_period = matchup_period or week
+        data = await self.league_get(
+            league_id, season, ["mMatchupScore", "mScoreboard"],
+            scoring_period=week,
+            fantasy_filter={"schedule": {"filterMatchupPeriodIds": {"value": [matchup_period]}}},
+            **creds,
+        )
+        return parse_box_score_rows(data, int(season), int(week), int(matchup_period), team_names or {})
+
+    async def fetch_live_scores(self, league_id: int, season: int, week: int, matchup_period: int | None = None,
+                                etag: str | None = None, **creds) -> tuple[list[tuple] | None, str | None]:
+        """
+        Team scores for the week's matchups only, as (games rows or None if
+        unchanged since `etag`, etag). Same request as the box scores, but
+        player rows aren't built.
+        """
+        matchup_period = matchup_period or week
+        data, etag = await self.league_get_if_changed(
+            league_id, season, ["mMatchupScore", "mScoreboard"], etag=etag,
+            scoring_period=week,
+            fantasy_filter={"schedule": {"filterMatchupPeriodIds": {"value": [matchup_period]}}},
+            **creds,
+        )
+        if data is None:
+            return None, etag
+        return parse_matchup_scores(data, int(matchup_period)), etag
+
+
+def _player_position(player: dict) -> str | None:
+    # Same rule espn_api uses: first eligible slot that isn't a combo or rookie slot
+    name = player.get("fullName", "")
+    for slot_id in player.get("eligibleSlots", []):
+        pos = POSITION_MAP.get(slot_id, "")
+        if (slot_id != 25 and "/" not in pos) or "/" in name:
+            return pos
+    return None
+
+
+def _player_points(player: dict, season: int, week: int) -> float:
+    for stats in player.get("stats", []):
+        if stats.get("seasonId") != season or stats.get("statSplitTypeId") == 2:
+            continue
+        if stats.get("scoringPeriodId") == week and stats.get("statSourceId") == 0:
+            return round(stats.get("appliedTotal", 0), 2)
+    return 0
+
+
+def parse_matchup_scores(data: dict, matchup_period: int) -> list[tuple]:
+    """Just the games rows of parse_box_score_rows (team names left empty)."""
+    games: list[tuple] = []
+    schedule = [m for m in data.get("schedule", []) if m.get("matchupPeriodId", matchup_period) == matchup_period]
+    for i, matchup in enumerate(schedule):
+        sides = []
+        for side in ("home", "away"):
+            team = matchup.get(side) or {}
+            score = team.get("totalPointsLive", team.get("totalPoints", 0))
+            sides.extend((team.get("teamId", 0), None, round(score or 0, 2)))
+        games.append((i, *sides))
+    return games
+
+
+def parse_box_score_rows(data: dict, season: int, week: int, matchup_period: int,
+                         team_names: dict) -> tuple[list[tuple], list[tuple]]:
+    games: list[tuple] = []
+    players: list[tuple] = []
+    schedule = [m for m in data.get("schedule", []) if m.get("matchupPeriodId", matchup_period) == matchup_period]
+    for i, matchup in enumerate(schedule):
+        sides = {}
+        for side in ("home", "away"):
+            team = matchup.get(side)
+            if not team:
+                sides[side] = (0, None, 0)
+                continue
+            team_id = team.get("teamId", 0)
+            if "totalPointsLive" in team:
+                score = round(team["totalPointsLive"], 2)
+            else:
+                score = round(team.get("totalPoints", 0), 2)
+            sides[side] = (team_id, team_names.get(team_id), score)
+
+            entries = team.get("rosterForCurrentScoringPeriod", {}).get("entries", [])
+            for entry in entries:
+                player = entry.get("playerPoolEntry", {}).get("player") or entry.get("player", {})
+                players.append((
+                    i, side, team_id,
+                    player.get("id"),
+                    player.get("fullName"),
+                    _player_position(player),
+                    POSITION_MAP.get(entry.get("lineupSlotId"), "FA"),
+                    _player_points(player, season, week),
+                ))
+        games.append((i, *sides["home"], *sides["away"]))
+    return games, players
@@ -0,0 +1,127 @@
+# espn_limiter.py
+import asyncio
+import random
+import re
+import time
+import aiohttp
+import requests
+from espn_client import EspnHTTPError
+from recap_queue import PriorityGate
+
+_HTTP_STATUS = re.compile(r"HTTP (\d{3})")
+
+
+def is_throttle_error(e: Exception) -> bool:
+    """Errors worth backing off and retrying: 429/5xx, timeouts and dropped connections."""
+    if isinstance(e, (asyncio.TimeoutError, aiohttp.ClientConnectionError,
+                      requests.exceptions.ConnectionError, requests.exceptions.Timeout)):
+        return True
+    status = getattr(e, "status", None)
+    if status is None and not isinstance(e, EspnHTTPError):
+        # espn_api raises ESPNUnknownError("ESPN returned an HTTP 503")
+        match = _HTTP_STATUS.search(str(e))
+        status = int(match.group(1)) if match else None
+    return status is not None and (status == 429 or status >= 500)
+
+
+class TokenBucket:
+    """Caps the ESPN request rate; rate <= 0 disables it."""
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+
+    async def take(self):
+        if self.rate <= 0:
+            return
+        while True:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return
+            await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class AdaptiveLimiter:
+    """
+    Rate + concurrency control for ESPN calls.
+      - token bucket for the request rate
+      - AIMD concurrency: +1 after `limit` fast successes in a row, halved on
+        429/5xx/timeouts (at most once per cooldown)
+      - throttled calls retried with jittered exponential backoff
+    Concurrency slots are handed out by job priority (see PriorityGate).
+    """
+    def __init__(self, initial: int, ceiling: int, rate: float, burst: int,
+                 latency_target: float, max_retries: int, backoff_base: float, backoff_cap: float):
+        self.gate = PriorityGate(initial)
+        self.ceiling = max(initial, ceiling)
+        self.bucket = TokenBucket(rate, burst)
+        self.latency_target = latency_target
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self._healthy_streak = 0
+        self._last_decrease = 0.0
+
+    @property
+    def limit(self) -> int:
+        return self.gate.limit
+
+    def _on_success(self, latency: float):
+        if latency > self.latency_target:
+            self._healthy_streak = 0
+            return
+        self._healthy_streak += 1
+        if self._healthy_streak >= self.gate.limit and self.gate.limit < self.ceiling:
+            self._healthy_streak = 0
+            self.gate.set_limit(self.gate.limit + 1)
+
+    def _on_throttle(self):
+        self._healthy_streak = 0
+        now = time.monotonic()
+        # Calls already in flight fail together; count that as one signal
+        if now - self._last_decrease >= self.latency_target:
+            self._last_decrease = now
+            self.gate.set_limit(max(1, self.gate.limit // 2))
+
+    def _backoff(self, attempt: int) -> float:
+        # "Full jitter": uniform between 0 and the exponential cap
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    def _release_when_done(self, work: asyncio.Future):
+        if not work.cancelled():
+            work.exception()  # nobody awaits it any more; don't warn about the error
+        self.gate.release()
+
+    async def call(self, make_awaitable, timeout: float, cancellable: bool = True):
+        """
+        Await make_awaitable() under the limiter, retrying throttled attempts.
+        cancellable=False is for work a timeout can't stop (a worker thread): an
+        attempt that times out keeps its slot until it really finishes and isn't
+        retried, so abandoned requests never run past the concurrency limit.
+        """
+        for attempt in range(self.max_retries + 1):
+            await self.bucket.take()
+            await self.gate.acquire()
+            started = time.monotonic()
+            work = asyncio.ensure_future(make_awaitable())
+            try:
+                result = await asyncio.wait_for(work if cancellable else asyncio.shield(work), timeout=timeout)
+            except Exception as e:
+                throttled = is_throttle_error(e)
+                if throttled:
+                    self._on_throttle()
+                if not throttled or attempt == self.max_retries or not work.done():
+                    raise
+            else:
+                self._on_success(time.monotonic() - started)
+                return result
+            finally:
+                if work.done():
+                    self.gate.release()
+                else:
+                    work.add_done_callback(self._release_when_done)
+            await asyncio.sleep(self._backoff(attempt))
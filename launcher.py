@@ -0,0 +1,127 @@
+# launcher.py
+"""
+Runs the bot as several processes, each connecting its own slice of shards,
+so recap building and ESPN parsing spread across cores instead of one GIL.
+
+    SHARD_COUNT=8 SHARD_PROCESSES=4 python launcher.py      # shards 0-1, 2-3, 4-5, 6-7
+    SHARD_COUNT=auto python launcher.py                     # Discord's count, one process per core
+
+Every process shares the SQLite database (WAL) and serves /metrics on
+METRICS_PORT + its index. Processes that exit unexpectedly are restarted.
+"""
+import asyncio
+import os
+import signal
+import sys
+import aiohttp
+from dotenv import load_dotenv
+
+load_dotenv()
+
+BOT_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "bot.py")
+SHARD_COUNT = os.getenv("SHARD_COUNT", "auto").strip().lower()
+SHARD_PROCESSES = int(os.getenv("SHARD_PROCESSES", "0")) or (os.cpu_count() or 1)
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+RESTART_DELAY_SECONDS = 5
+RESTART_DELAY_MAX_SECONDS = 300
+
+
+async def recommended_shard_count(token: str) -> int:
+    """Discord's recommended shard count for this bot (GET /gateway/bot)."""
+    async with aiohttp.ClientSession() as session:
+        async with session.get(
+            "https://discord.com/api/v10/gateway/bot",
+            headers={"Authorization": f"Bot {token}"},
+            timeout=aiohttp.ClientTimeout(total=30),
+        ) as resp:
+            resp.raise_for_status()
+            return int((await resp.json())["shards"])
+
+
+def split_shards(shard_count: int, processes: int) -> list[list[int]]:
+    """Contiguous, near-equal shard ranges, one per process (never an empty one)."""
+    processes = max(1, min(processes, shard_count))
+    size, extra = divmod(shard_count, processes)
+    ranges, start = [], 0
+    for i in range(processes):
+        end = start + size + (1 if i < extra else 0)
+        ranges.append(list(range(start, end)))
+        start = end
+    return ranges
+
+
+def _process_env(index: int, shard_count: int, shard_ids: list[int]) -> dict:
+    env = dict(os.environ)
+    env["SHARD_COUNT"] = str(shard_count)
+    env["SHARD_IDS"] = f"{shard_ids[0]}-{shard_ids[-1]}"
+    env["METRICS_PORT"] = str(METRICS_PORT + index)
+    return env
+
+
+async def supervise(label: str, script: str, env: dict, stopping: asyncio.Event):
+    """Keep one Python process running until shutdown, restarting it with backoff."""
+    delay = RESTART_DELAY_SECONDS
+    while not stopping.is_set():
+        started = asyncio.get_running_loop().time()
+        proc = await asyncio.create_subprocess_exec(sys.executable, script, env=env)
+        print(f"🚀 {label} started (pid {proc.pid})")
+        wait = asyncio.create_task(proc.wait())
+        stop = asyncio.create_task(stopping.wait())
+        await asyncio.wait((wait, stop), return_when=asyncio.FIRST_COMPLETED)
+        if stopping.is_set():
+            if proc.returncode is None:
+                proc.terminate()
+                try:
+                    await asyncio.wait_for(wait, timeout=30)
+                except asyncio.TimeoutError:
+                    proc.kill()
+                    await wait
+            return
+        stop.cancel()
+        if asyncio.get_running_loop().time() - started > RESTART_DELAY_MAX_SECONDS:
+            delay = RESTART_DELAY_SECONDS  # it had been healthy; don't keep the old backoff
+        print(f"⚠️ {label} exited with code {proc.returncode}; restarting in {delay}s")
+        try:
+            await asyncio.wait_for(stopping.wait(), timeout=delay)
+        except asyncio.TimeoutError:
+            pass
+        delay = min(RESTART_DELAY_MAX_SECONDS, delay * 2)
+
+
+def stop_on_signals() -> asyncio.Event:
+    """Event set on SIGINT/SIGTERM."""
+    stopping = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stopping.set)
+        except NotImplementedError:  # Windows
+            pass
+    return stopping
+
+
+async def main():
+    if SHARD_COUNT == "auto":
+        token = os.environ.get("DISCORD_TOKEN")
+        if not token:
+            print("❌ DISCORD_TOKEN is not set")
+            return 1
+        shard_count = await recommended_shard_count(token)
+    else:
+        shard_count = int(SHARD_COUNT)
+    ranges = split_shards(shard_count, SHARD_PROCESSES)
+    print(f"🧩 {shard_count} shard(s) across {len(ranges)} process(es)")
+
+    stopping = stop_on_signals()
+    await asyncio.gather(*(
+        supervise(
+            f"Process {index} (shards {shard_ids[0]}-{shard_ids[-1]} of {shard_count})",
+            BOT_SCRIPT, _process_env(index, shard_count, shard_ids), stopping,
+        )
+        for index, shard_ids in enumerate(ranges)
+    ))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
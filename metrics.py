@@ -0,0 +1,216 @@
+# metrics.py
+import functools
+import os
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from aiohttp import web
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Off by default; METRICS_ENABLED=1 serves /metrics on METRICS_HOST:METRICS_PORT
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+METRICS_HOST = os.getenv("METRICS_HOST", "127.0.0.1")
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 40, 80, 160)
+
+_REGISTRY: list["_Metric"] = []
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _fmt_labels(pairs) -> str:
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels=()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labels)
+        _REGISTRY.append(self)
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels[n]) for n in self.labelnames)
+
+    def _samples(self):
+        return []
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, key, extra, value in self._samples():
+            labels = _fmt_labels([*zip(self.labelnames, key), *extra])
+            lines.append(f"{self.name}{suffix}{labels} {value:g}")
+        return lines
+
+
+class Counter(_Metric):
+    """Monotonic count, one series per label combination."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0)
+
+    def _samples(self):
+        for key, value in self._values.items():
+            yield "", key, (), value
+
+
+class Gauge(_Metric):
+    """Point-in-time value, either set directly or read from a callback at scrape time."""
+    kind = "gauge"
+
+    def __init__(self, name: str, help: str, labels=()):
+        super().__init__(name, help, labels)
+        self._values: dict[tuple, float] = {}
+        self._fn = None
+
+    def set(self, value: float, **labels):
+        self._values[self._key(labels)] = value
+
+    def set_function(self, fn):
+        """fn() returns a number, or {label-values tuple: number} for labelled gauges."""
+        self._fn = fn
+
+    def _samples(self):
+        values = dict(self._values)
+        if self._fn is not None:
+            try:
+                result = self._fn()
+            except Exception:
+                result = {}
+            values.update(result if isinstance(result, dict) else {(): result})
+        for key, value in values.items():
+            yield "", key, (), value
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram (Prometheus layout) with _sum and _count."""
+    kind = "histogram"
+
+    def __init__(self, name: str, help: str, labels=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (+Inf last), sum, count]
+        self._values: dict[tuple, list] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        entry = self._values.get(key)
+        if entry is None:
+            entry = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        entry[0][bisect_left(self.buckets, value)] += 1
+        entry[1] += value
+        entry[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - started, **labels)
+
+    def timed(self, **labels):
+        """Decorator: observe how long each call of an async function takes."""
+        def decorator(func):
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                with self.time(**labels):
+                    return await func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    def totals(self) -> dict[tuple, tuple[float, int]]:
+        """{label values: (sum, count)} for every series observed so far."""
+        return {key: (total, count) for key, (_, total, count) in self._values.items()}
+
+    def _samples(self):
+        for key, (counts, total, count) in self._values.items():
+            cumulative = 0
+            for bound, n in zip((*self.buckets, "+Inf"), counts):
+                cumulative += n
+                yield "_bucket", key, (("le", bound if bound == "+Inf" else f"{bound:g}"),), cumulative
+            yield "_sum", key, (), total
+            yield "_count", key, (), count
+
+
+def render() -> str:
+    lines = []
+    for metric in _REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+# ---------- Metric catalog ----------
+ESPN_CALL_SECONDS = Histogram(
+    "recap_espn_call_seconds", "ESPN call latency including limiter wait and retries", ("call", "outcome"))
+ESPN_CALLS_PER_RECAP = Histogram(
+    "recap_espn_calls_per_recap", "ESPN calls made by one recap build", ("kind",), buckets=COUNT_BUCKETS)
+ESPN_CONCURRENCY_LIMIT = Gauge("recap_espn_concurrency_limit", "Current adaptive ESPN concurrency limit")
+ESPN_WAITING = Gauge("recap_espn_waiting", "ESPN calls waiting for a limiter slot")
+
+BUILD_SECONDS = Histogram("recap_build_seconds", "Embed/page builder latency", ("stage",))
+DISCORD_SEND_SECONDS = Histogram("recap_discord_send_seconds", "Discord send latency", ("target",))
+DISCORD_OUTBOX_WAIT_SECONDS = Histogram(
+    "recap_discord_outbox_wait_seconds", "Time a Discord request waited in the outbox for rate-limit room", ("target",))
+DISCORD_OUTBOX_DEPTH = Gauge("recap_discord_outbox_depth", "Discord requests waiting in the outbox")
+
+QUEUE_DEPTH = Gauge("recap_queue_depth", "Jobs waiting in the recap scheduler", ("priority",))
+QUEUE_WAIT_SECONDS = Histogram("recap_queue_wait_seconds", "Time a job waited before a worker picked it up", ("priority",))
+JOB_SECONDS = Histogram("recap_job_seconds", "Job run time", ("priority", "outcome"))
+GUILD_JOB_SECONDS = Counter("recap_guild_job_seconds_total", "Total recap job run time per guild", ("guild",))
+GUILD_JOBS = Counter("recap_guild_jobs_total", "Recap jobs run per guild", ("guild", "outcome"))
+
+SQLITE_SECONDS = Histogram("recap_sqlite_seconds", "settings_manager query latency", ("op",))
+CACHE_LOOKUPS = Counter("recap_cache_lookups_total", "Cache lookups by result", ("cache", "result"))
+CACHE_HIT_RATIO = Gauge("recap_cache_hit_ratio", "Hit ratio per cache since startup", ("cache",))
+
+
+def hit_ratio(cache: str) -> float:
+    hits = CACHE_LOOKUPS.value(cache=cache, result="hit")
+    total = sum(v for (name, _), v in CACHE_LOOKUPS._values.items() if name == cache)
+    return hits / total if total else 0.0
+
+
+# ---------- Exporter ----------
+async def _handle_metrics(request: web.Request) -> web.Response:
+    return web.Response(
+        body=render().encode(),
+        headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+    )
+
+
+async def start_metrics_server(host: str = METRICS_HOST, port: int = METRICS_PORT) -> web.AppRunner | None:
+    """Serve /metrics when METRICS_ENABLED; returns the runner to pass to stop_metrics_server."""
+    if not METRICS_ENABLED:
+        return None
+    app = web.Application()
+    app.router.add_get("/metrics", _handle_metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    print(f"📈 Metrics on http://{host}:{port}/metrics")
+    return runner
+
+
+async def stop_metrics_server(runner: web.AppRunner | None):
+    if runner is not None:
+        await runner.cleanup()
@@ -0,0 +1,98 @@
+# recap_queue.py
+import asyncio
+import contextvars
+import heapq
+import itertools
+import time
+from collections import OrderedDict, deque
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_SCHEDULED = 1
+PRIORITY_NAMES = {PRIORITY_INTERACTIVE: "interactive", PRIORITY_SCHEDULED: "scheduled"}
+
+# Priority of the job currently running; ESPN calls made on its behalf inherit it
+JOB_PRIORITY: contextvars.ContextVar[int] = contextvars.ContextVar("job_priority", default=PRIORITY_INTERACTIVE)
+
+
+class RecapScheduler:
+    """
+    Replaces a plain FIFO queue for scheduled recap work (auto-post, pre-render).
+      - each job has a key (a league) with its own FIFO
+      - keys are served round-robin, so one busy key can't starve the rest
+    Jobs need a .key attribute. Interactive recaps are durable recap_jobs rows instead.
+    """
+    def __init__(self):
+        self._queues: OrderedDict = OrderedDict()
+        self._cond = asyncio.Condition()
+
+    def qsize(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    async def put(self, job):
+        job.enqueued_at = time.monotonic()
+        self._queues.setdefault(job.key, deque()).append(job)
+        async with self._cond:
+            self._cond.notify_all()
+
+    async def get(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: bool(self._queues))
+            key, q = next(iter(self._queues.items()))
+            job = q.popleft()
+            if q:
+                self._queues.move_to_end(key)
+            else:
+                del self._queues[key]
+            return job
+
+
+class PriorityGate:
+    """
+    Semaphore that admits waiters by JOB_PRIORITY (interactive first), FIFO within
+    a class, so scheduled bursts can't push interactive ESPN calls to the back.
+    """
+    def __init__(self, limit: int):
+        self.limit = max(1, limit)
+        self._active = 0
+        self._waiters: list[tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+
+    @property
+    def waiting(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self):
+        if self._active < self.limit and not self.waiting:
+            self._active += 1
+            return
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (JOB_PRIORITY.get(), next(self._seq), fut))
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                # We were handed a slot just as we got cancelled; give it back
+                self.release()
+            raise
+
+    def set_limit(self, limit: int):
+        self.limit = max(1, limit)
+        self._wake()
+
+    def release(self):
+        self._active -= 1
+        self._wake()
+
+    def _wake(self):
+        while self._waiters and self._active < self.limit:
+            _, _, fut = heapq.heappop(self._waiters)
+            if not fut.done():
+                self._active += 1
+                fut.set_result(None)
+
+    async def __aenter__(self):
+        await self.acquire()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
@@ -0,0 +1,70 @@
+# recap_worker.py
+"""
+Builds /weeklyrecap pages outside the gateway, so heavy builds never hold up
+Discord heartbeats. Workers claim jobs from the recap_jobs table in the shared
+SQLite database and store serialized pages; the gateway sends them.
+
+    EXTERNAL_RECAP_WORKERS=1 python bot.py        # gateway only queues and sends
+    RECAP_WORKER_PROCESSES=4 python recap_worker.py
+
+Each process runs QUEUE_WORKERS builders and serves /metrics on
+METRICS_PORT + 100 + its index. A worker that dies mid-build lets its lease
+lapse and the job is picked up again.
+"""
+import asyncio
+import os
+import socket
+import sys
+from dotenv import load_dotenv
+
+from launcher import stop_on_signals, supervise
+
+load_dotenv()
+
+RECAP_WORKER_PROCESSES = int(os.getenv("RECAP_WORKER_PROCESSES", "2"))
+METRICS_PORT = int(os.getenv("METRICS_PORT", "9108"))
+
+
+async def run_worker(index: int):
+    import bot  # reads the environment at import
+    from metrics import start_metrics_server, stop_metrics_server
+
+    await bot.init_db()
+    metrics_runner = await start_metrics_server(port=METRICS_PORT + 100 + index)
+    worker = f"{socket.gethostname()}:{os.getpid()}"
+    builders = [asyncio.create_task(bot.recap_builder(f"{worker}/{i}")) for i in range(max(1, bot.QUEUE_WORKERS))]
+    print(f"🛠️ Recap worker {index} running {len(builders)} builder(s)")
+    try:
+        await stop_on_signals().wait()
+    finally:
+        # Builders hand their current job back to the queue when cancelled
+        for task in builders:
+            task.cancel()
+        await asyncio.gather(*builders, return_exceptions=True)
+        await stop_metrics_server(metrics_runner)
+        await bot._ESPN_CLIENT.close()
+        await bot.close_db()
+
+
+async def run_pool():
+    stopping = stop_on_signals()
+    script = os.path.abspath(__file__)
+    await asyncio.gather(*(
+        supervise(f"Recap worker {index}", script, {**os.environ, "RECAP_WORKER_INDEX": str(index)}, stopping)
+        for index in range(RECAP_WORKER_PROCESSES)
+    ))
+
+
+def main():
+    index = os.getenv("RECAP_WORKER_INDEX")
+    if index is not None:
+        asyncio.run(run_worker(int(index)))
+    elif RECAP_WORKER_PROCESSES <= 1:
+        asyncio.run(run_worker(0))
+    else:
+        asyncio.run(run_pool())
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
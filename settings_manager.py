@@ -1,8 +1,13 @@
 # settings_manager.py
 import aiosqlite
+import asyncio
 import os
+import time
+import uuid
+from contextlib import asynccontextmanager
 from dotenv import load_dotenv
 from pathlib import Path
+from metrics import SQLITE_SECONDS
 
 load_dotenv()
 
@@ -14,63 +19,718 @@ _db_dir = os.path.dirname(DB_PATH)
 if _db_dir:
     Path(_db_dir).mkdir(parents=True, exist_ok=True)
 
-async def init_db():
-    async with aiosqlite.connect(DB_PATH) as db:
-        await db.execute("""
-            CREATE TABLE IF NOT EXISTS guild_settings (
-                guild_id TEXT PRIMARY KEY,
-                league_id TEXT,
-                season TEXT,
-                swid TEXT,
-                espn_s2 TEXT,
-                channel_id TEXT,
-                autopost_enabled INTEGER DEFAULT 0
-            )
-        """)
+# ---------- Schema ----------
+# Each entry upgrades PRAGMA user_version by one; only missing steps run at startup.
+_MIGRATIONS: list[list[str]] = [
+    # 1: guild settings + durable box-score cache
+    [
+        """
+        CREATE TABLE IF NOT EXISTS guild_settings (
+            guild_id TEXT PRIMARY KEY,
+            league_id TEXT,
+            season TEXT,
+            swid TEXT,
+            espn_s2 TEXT,
+            channel_id TEXT,
+            autopost_enabled INTEGER DEFAULT 0
+        )
+        """,
+        # Durable box-score cache: one row per fetched week, plus its games and players
+        """
+        CREATE TABLE IF NOT EXISTS box_score_weeks (
+            league_id TEXT,
+            season TEXT,
+            week INTEGER,
+            is_final INTEGER DEFAULT 0,
+            fetched_at REAL,
+            PRIMARY KEY (league_id, season, week)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS box_score_games (
+            league_id TEXT,
+            season TEXT,
+            week INTEGER,
+            game_index INTEGER,
+            home_team_id INTEGER,
+            home_team_name TEXT,
+            home_score REAL,
+            away_team_id INTEGER,
+            away_team_name TEXT,
+            away_score REAL,
+            PRIMARY KEY (league_id, season, week, game_index)
+        )
+        """,
+        """
+        CREATE TABLE IF NOT EXISTS box_score_players (
+            league_id TEXT,
+            season TEXT,
+            week INTEGER,
+            game_index INTEGER,
+            side TEXT,
+            team_id INTEGER,
+            player_id INTEGER,
+            name TEXT,
+            position TEXT,
+            slot TEXT,
+            points REAL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_box_score_players_week
+        ON box_score_players (league_id, season, week)
+        """,
+    ],
+    # 2: scheduler looks up autopost guilds directly
+    [
+        """
+        CREATE INDEX IF NOT EXISTS idx_guild_settings_autopost
+        ON guild_settings (autopost_enabled)
+        """,
+    ],
+    # 3: pre-rendered recap pages (serialized embeds) per league week
+    [
+        """
+        CREATE TABLE IF NOT EXISTS recap_artifacts (
+            league_id TEXT,
+            season TEXT,
+            week INTEGER,
+            payload TEXT,
+            built_at REAL,
+            PRIMARY KEY (league_id, season, week)
+        )
+        """,
+    ],
+    # 4: posted week navigators, so their buttons keep working across restarts
+    [
+        """
+        CREATE TABLE IF NOT EXISTS recap_navigators (
+            message_id TEXT PRIMARY KEY,
+            guild_id TEXT,
+            league_id TEXT,
+            season TEXT,
+            last_week INTEGER,
+            created_at REAL
+        )
+        """,
+    ],
+    # 5: scoring precision (decimal places) per league season
+    [
+        """
+        CREATE TABLE IF NOT EXISTS league_precision (
+            league_id TEXT,
+            season TEXT,
+            precision INTEGER,
+            detected_at REAL,
+            PRIMARY KEY (league_id, season)
+        )
+        """,
+    ],
+    # 6: durable /weeklyrecap jobs, built by any worker and sent by the guild's gateway
+    [
+        """
+        CREATE TABLE IF NOT EXISTS recap_jobs (
+            job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+            guild_id TEXT,
+            channel_id TEXT,
+            priority INTEGER,
+            status TEXT,
+            attempts INTEGER DEFAULT 0,
+            claim_token TEXT,
+            lease_until REAL,
+            started_at REAL,
+            league_id TEXT,
+            season TEXT,
+            week INTEGER,
+            last_week INTEGER,
+            payload TEXT,
+            error TEXT,
+            created_at REAL,
+            updated_at REAL
+        )
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_recap_jobs_status
+        ON recap_jobs (status, priority, job_id)
+        """,
+        """
+        CREATE INDEX IF NOT EXISTS idx_recap_jobs_guild
+        ON recap_jobs (guild_id, status)
+        """,
+    ],
+    # 7: opt-in live scoring and the pinned message it keeps editing
+    [
+        "ALTER TABLE guild_settings ADD COLUMN live_enabled INTEGER DEFAULT 0",
+        "ALTER TABLE guild_settings ADD COLUMN live_message_id TEXT",
+    ],
+    # 8: recap jobs are claimed oldest first; recap_jobs.priority is no longer used
+    [
+        "DROP INDEX IF EXISTS idx_recap_jobs_status",
+        "CREATE INDEX IF NOT EXISTS idx_recap_jobs_status ON recap_jobs (status, job_id)",
+    ],
+    # 9: when ESPN first reported a cached week as past, to time the stat-correction window
+    [
+        "ALTER TABLE box_score_weeks ADD COLUMN closed_at REAL",
+    ],
+    # 10: navigators are pruned by age
+    [
+        "CREATE INDEX IF NOT EXISTS idx_recap_navigators_created ON recap_navigators (created_at)",
+    ],
+    # 11: whether a pre-rendered page was built only from settled (final) weeks
+    [
+        "ALTER TABLE recap_artifacts ADD COLUMN final INTEGER NOT NULL DEFAULT 0",
+    ],
+]
+
+# ---------- Connection ----------
+# One long-lived connection per process. sqlite3 keeps a prepared-statement cache
+# per connection keyed by SQL text, so the fixed queries below are compiled once.
+_DB: aiosqlite.Connection | None = None
+_DB_OPEN_LOCK = asyncio.Lock()
+_WRITE_LOCK = asyncio.Lock()
+
+async def _migrate(db: aiosqlite.Connection):
+    # Shard and recap-worker processes all start against the same file; the write
+    # lock lets one of them migrate while the others wait, then read the new version
+    await db.execute("BEGIN IMMEDIATE")
+    try:
+        async with db.execute("PRAGMA user_version") as cursor:
+            version = (await cursor.fetchone())[0]
+        for target, statements in enumerate(_MIGRATIONS[version:], start=version + 1):
+            for sql in statements:
+                await db.execute(sql)
+            await db.execute(f"PRAGMA user_version = {target}")
         await db.commit()
+    except BaseException:
+        await db.rollback()
+        raise
+
+async def get_db() -> aiosqlite.Connection:
+    """Shared connection, opened (WAL mode, schema migrated) on first use."""
+    global _DB
+    if _DB is not None:
+        return _DB
+    async with _DB_OPEN_LOCK:
+        if _DB is None:
+            db = await aiosqlite.connect(DB_PATH, cached_statements=256)
+            try:
+                await db.execute("PRAGMA busy_timeout=5000")
+                await db.execute("PRAGMA journal_mode=WAL")
+                await db.execute("PRAGMA synchronous=NORMAL")
+                await _migrate(db)
+            except BaseException:
+                await db.close()
+                raise
+            _DB = db
+    return _DB
+
+async def init_db():
+    await get_db()
+
+async def close_db():
+    global _DB
+    if _DB is not None:
+        await _DB.close()
+        _DB = None
+
+@asynccontextmanager
+async def _transaction():
+    # Writes share one connection, so keep multi-statement writes from interleaving
+    db = await get_db()
+    async with _WRITE_LOCK:
+        try:
+            yield db
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
+
+# ---------- Guild settings ----------
+# In-process copy of guild_settings, bulk-loaded at startup and updated write-through.
+_SETTINGS_CACHE: dict[str, dict] = {}
+_SETTINGS_LOADED = False
+_SETTINGS_STATS = {"hits": 0, "misses": 0}
 
+_SETTINGS_COLUMNS = "league_id, season, swid, espn_s2, channel_id, autopost_enabled, live_enabled, live_message_id"
+
+def _row_to_settings(row) -> dict:
+    return {
+        "league_id": int(row[0]),
+        "season": int(row[1]),
+        "swid": row[2],
+        "espn_s2": row[3],
+        "channel_id": int(row[4]),
+        "autopost_enabled": bool(row[5]),
+        "live_enabled": bool(row[6]),
+        "live_message_id": int(row[7]) if row[7] else None
+    }
+
+@SQLITE_SECONDS.timed(op="select_guild_settings")
+async def _select_guild_settings(db, guild_id):
+    async with db.execute(f"""
+        SELECT {_SETTINGS_COLUMNS}
+        FROM guild_settings
+        WHERE guild_id = ?
+    """, (str(guild_id),)) as cursor:
+        row = await cursor.fetchone()
+    return _row_to_settings(row) if row else None
+
+@SQLITE_SECONDS.timed(op="load_all_guild_settings")
+async def load_all_guild_settings(guild_filter=None) -> int:
+    """
+    Load guild_settings rows into the cache; returns how many were kept.
+    guild_filter(guild_id) limits it to the guilds this process serves (sharding).
+    """
+    global _SETTINGS_LOADED
+    db = await get_db()
+    async with db.execute(f"""
+        SELECT {_SETTINGS_COLUMNS}, guild_id
+        FROM guild_settings
+    """) as cursor:
+        rows = await cursor.fetchall()
+    _SETTINGS_CACHE.clear()
+    for row in rows:
+        if guild_filter is None or guild_filter(int(row[8])):
+            _SETTINGS_CACHE[str(row[8])] = _row_to_settings(row)
+    _SETTINGS_LOADED = True
+    return len(_SETTINGS_CACHE)
+
+def get_settings_cache_stats() -> dict:
+    hits, misses = _SETTINGS_STATS["hits"], _SETTINGS_STATS["misses"]
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / (hits + misses) if hits + misses else 0.0,
+        "size": len(_SETTINGS_CACHE),
+        "loaded": _SETTINGS_LOADED,
+    }
+
+@SQLITE_SECONDS.timed(op="set_guild_settings")
 async def set_guild_settings(guild_id, league_id, season, swid, espn_s2, channel_id):
-    await init_db()
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with _transaction() as db:
         await db.execute("""
             INSERT OR REPLACE INTO guild_settings (
-                guild_id, league_id, season, swid, espn_s2, channel_id, autopost_enabled
+                guild_id, league_id, season, swid, espn_s2, channel_id,
+                autopost_enabled, live_enabled, live_message_id
             )
             VALUES (
                 ?, ?, ?, ?, ?, ?,
-                COALESCE((SELECT autopost_enabled FROM guild_settings WHERE guild_id = ?), 0)
+                COALESCE((SELECT autopost_enabled FROM guild_settings WHERE guild_id = ?), 0),
+                COALESCE((SELECT live_enabled FROM guild_settings WHERE guild_id = ?), 0),
+                (SELECT live_message_id FROM guild_settings WHERE guild_id = ?)
             )
-        """, (str(guild_id), league_id, season, swid, espn_s2, channel_id, str(guild_id)))
-        await db.commit()
+        """, (str(guild_id), league_id, season, swid, espn_s2, channel_id, *[str(guild_id)] * 3))
+        settings = await _select_guild_settings(db, guild_id)
+    _SETTINGS_CACHE[str(guild_id)] = settings
 
-async def get_guild_settings(guild_id):
-    await init_db()
-    async with aiosqlite.connect(DB_PATH) as db:
-        async with db.execute("""
-            SELECT league_id, season, swid, espn_s2, channel_id, autopost_enabled
-            FROM guild_settings
-            WHERE guild_id = ?
-        """, (str(guild_id),)) as cursor:
-            row = await cursor.fetchone()
-            if row:
-                return {
-                    "league_id": int(row[0]),
-                    "season": int(row[1]),
-                    "swid": row[2],
-                    "espn_s2": row[3],
-                    "channel_id": int(row[4]),
-                    "autopost_enabled": bool(row[5])
-                }
-            return None
+async def get_guild_settings(guild_id, use_cache=True):
+    """use_cache=False reads the row directly, for processes that don't own the guild (recap workers)."""
+    key = str(guild_id)
+    if not use_cache:
+        return await _select_guild_settings(await get_db(), key)
+    cached = _SETTINGS_CACHE.get(key)
+    if cached is not None:
+        _SETTINGS_STATS["hits"] += 1
+        return dict(cached)
+    if _SETTINGS_LOADED:
+        # Whole table is cached, so a missing guild simply hasn't run /setup
+        _SETTINGS_STATS["hits"] += 1
+        return None
+
+    _SETTINGS_STATS["misses"] += 1
+    settings = await _select_guild_settings(await get_db(), key)
+    if settings:
+        _SETTINGS_CACHE[key] = settings
+        return dict(settings)
+    return None
+
+@SQLITE_SECONDS.timed(op="get_autopost_guild_settings")
+async def get_autopost_guild_settings() -> list[dict]:
+    """Every guild with autopost enabled, in one indexed query. Each dict includes guild_id."""
+    db = await get_db()
+    async with db.execute(f"""
+        SELECT {_SETTINGS_COLUMNS}, guild_id
+        FROM guild_settings
+        WHERE autopost_enabled = 1
+    """) as cursor:
+        rows = await cursor.fetchall()
+    return [{**_row_to_settings(row), "guild_id": int(row[8])} for row in rows]
+
+async def list_guild_settings() -> list[dict]:
+    """Every configured guild (from the cache once loaded). Each dict includes guild_id."""
+    if not _SETTINGS_LOADED:
+        await load_all_guild_settings()
+    return [{**settings, "guild_id": int(guild_id)} for guild_id, settings in _SETTINGS_CACHE.items()]
 
+@SQLITE_SECONDS.timed(op="set_autopost")
 async def set_autopost(guild_id, enabled):
-    await init_db()
-    async with aiosqlite.connect(DB_PATH) as db:
+    async with _transaction() as db:
         await db.execute(
             "UPDATE guild_settings SET autopost_enabled = ? WHERE guild_id = ?",
             (int(enabled), str(guild_id))
         )
-        await db.commit()
+    cached = _SETTINGS_CACHE.get(str(guild_id))
+    if cached is not None:
+        cached["autopost_enabled"] = bool(enabled)
+
+@SQLITE_SECONDS.timed(op="set_live_scoring")
+async def set_live_scoring(guild_id, enabled, message_id=None):
+    """Turn live scoring on/off and remember the pinned message it edits (None = post a new one)."""
+    async with _transaction() as db:
+        await db.execute(
+            "UPDATE guild_settings SET live_enabled = ?, live_message_id = ? WHERE guild_id = ?",
+            (int(enabled), str(message_id) if message_id else None, str(guild_id))
+        )
+    cached = _SETTINGS_CACHE.get(str(guild_id))
+    if cached is not None:
+        cached["live_enabled"] = bool(enabled)
+        cached["live_message_id"] = int(message_id) if message_id else None
+
+@SQLITE_SECONDS.timed(op="set_live_scoring")
+async def set_live_message(guild_id, message_id) -> bool:
+    """Remember a newly posted scoreboard, unless live scoring was turned off meanwhile."""
+    async with _transaction() as db:
+        cursor = await db.execute(
+            "UPDATE guild_settings SET live_message_id = ? WHERE guild_id = ? AND live_enabled = 1",
+            (str(message_id), str(guild_id))
+        )
+        updated = cursor.rowcount > 0
+    cached = _SETTINGS_CACHE.get(str(guild_id))
+    if updated and cached is not None:
+        cached["live_message_id"] = int(message_id)
+    return updated
+
+# ---------- Box-score cache ----------
+@SQLITE_SECONDS.timed(op="save_box_score_week")
+async def save_box_score_week(league_id, season, week, games, players, is_final, closed_at=None):
+    """
+    Replace the cached rows for one league/season/week. closed_at: when the
+    week was first seen as past (None while it is still the current week).
+    games:   (game_index, home_team_id, home_team_name, home_score, away_team_id, away_team_name, away_score)
+    players: (game_index, side, team_id, player_id, name, position, slot, points)
+    """
+    key = (str(league_id), str(season), int(week))
+    async with _transaction() as db:
+        await db.execute(
+            "DELETE FROM box_score_games WHERE league_id = ? AND season = ? AND week = ?", key
+        )
+        await db.execute(
+            "DELETE FROM box_score_players WHERE league_id = ? AND season = ? AND week = ?", key
+        )
+        await db.executemany("""
+            INSERT INTO box_score_games (
+                league_id, season, week, game_index,
+                home_team_id, home_team_name, home_score,
+                away_team_id, away_team_name, away_score
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(*key, *g) for g in games])
+        await db.executemany("""
+            INSERT INTO box_score_players (
+                league_id, season, week, game_index, side,
+                team_id, player_id, name, position, slot, points
+            )
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        """, [(*key, *p) for p in players])
+        await db.execute("""
+            INSERT OR REPLACE INTO box_score_weeks (league_id, season, week, is_final, fetched_at, closed_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (*key, int(bool(is_final)), time.time(), closed_at))
+
+@SQLITE_SECONDS.timed(op="get_box_score_closed_at")
+async def get_box_score_closed_at(league_id, season, week) -> float | None:
+    """When a cached week was first seen as past, or None."""
+    db = await get_db()
+    async with db.execute("""
+        SELECT closed_at FROM box_score_weeks
+        WHERE league_id = ? AND season = ? AND week = ?
+    """, (str(league_id), str(season), int(week))) as cursor:
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+@SQLITE_SECONDS.timed(op="get_final_box_score_weeks")
+async def get_final_box_score_weeks(league_id, season) -> set[int]:
+    """Weeks of a league season cached as final (past the stat-correction window)."""
+    db = await get_db()
+    async with db.execute("""
+        SELECT week FROM box_score_weeks
+        WHERE league_id = ? AND season = ? AND is_final = 1
+    """, (str(league_id), str(season))) as cursor:
+        rows = await cursor.fetchall()
+    return {week for (week,) in rows}
+
+@SQLITE_SECONDS.timed(op="get_box_score_week")
+async def get_box_score_week(league_id, season, week, final_only=True):
+    """Cached (games, players) rows for a week, or None if not cached (or not final)."""
+    key = (str(league_id), str(season), int(week))
+    db = await get_db()
+    async with db.execute("""
+        SELECT is_final FROM box_score_weeks
+        WHERE league_id = ? AND season = ? AND week = ?
+    """, key) as cursor:
+        row = await cursor.fetchone()
+    if not row or (final_only and not row[0]):
+        return None
+
+    async with db.execute("""
+        SELECT game_index, home_team_id, home_team_name, home_score,
+               away_team_id, away_team_name, away_score
+        FROM box_score_games
+        WHERE league_id = ? AND season = ? AND week = ?
+        ORDER BY game_index
+    """, key) as cursor:
+        games = await cursor.fetchall()
+    async with db.execute("""
+        SELECT game_index, side, team_id, player_id, name, position, slot, points
+        FROM box_score_players
+        WHERE league_id = ? AND season = ? AND week = ?
+        ORDER BY rowid
+    """, key) as cursor:
+        players = await cursor.fetchall()
+    return games, players
+
+# ---------- Pre-rendered recap pages ----------
+@SQLITE_SECONDS.timed(op="save_recap_artifacts")
+async def save_recap_artifacts(league_id, season, pages, built_at=None, final_weeks=()):
+    """
+    pages: {week: serialized page payload}. Replaces any existing rows for those
+    weeks; final_weeks are the ones built only from final box scores.
+    """
+    built_at = time.time() if built_at is None else built_at
+    async with _transaction() as db:
+        await db.executemany("""
+            INSERT OR REPLACE INTO recap_artifacts (league_id, season, week, payload, built_at, final)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, [
+            (str(league_id), str(season), int(week), payload, built_at, int(week in final_weeks))
+            for week, payload in pages.items()
+        ])
+
+@SQLITE_SECONDS.timed(op="get_recap_artifacts")
+async def get_recap_artifacts(league_id, season):
+    """{week: (payload, built_at, final)} for every pre-rendered week of a league season."""
+    db = await get_db()
+    async with db.execute("""
+        SELECT week, payload, built_at, final FROM recap_artifacts
+        WHERE league_id = ? AND season = ?
+    """, (str(league_id), str(season))) as cursor:
+        rows = await cursor.fetchall()
+    return {week: (payload, built_at, bool(final)) for week, payload, built_at, final in rows}
+
+# ---------- Scoring precision ----------
+@SQLITE_SECONDS.timed(op="save_league_precision")
+async def save_league_precision(league_id, season, precision):
+    async with _transaction() as db:
+        await db.execute("""
+            INSERT OR REPLACE INTO league_precision (league_id, season, precision, detected_at)
+            VALUES (?, ?, ?, ?)
+        """, (str(league_id), str(season), int(precision), time.time()))
+
+@SQLITE_SECONDS.timed(op="get_league_precision")
+async def get_league_precision(league_id, season) -> int | None:
+    db = await get_db()
+    async with db.execute("""
+        SELECT precision FROM league_precision WHERE league_id = ? AND season = ?
+    """, (str(league_id), str(season))) as cursor:
+        row = await cursor.fetchone()
+    return row[0] if row else None
+
+# ---------- Recap jobs ----------
+# Lifecycle: queued -> running (leased to a worker) -> built | errored, which the
+# guild's gateway process sends and closes as posted | failed. A worker that
+# dies mid-build lets its lease lapse and the job is claimed again.
+RECAP_JOB_ACTIVE = ("queued", "running", "built", "errored")
+_RECAP_JOB_COLUMNS = (
+    "job_id, guild_id, channel_id, status, attempts, started_at, "
+    "league_id, season, week, last_week, payload, error, created_at, updated_at"
+)
+
+def _row_to_recap_job(row) -> dict:
+    return dict(zip((c.strip() for c in _RECAP_JOB_COLUMNS.split(",")), row))
+
+@SQLITE_SECONDS.timed(op="enqueue_recap_job")
+async def enqueue_recap_job(guild_id, channel_id) -> tuple[int, bool]:
+    """Queue a recap for a guild, or return its unfinished one: (job_id, created)."""
+    now = time.time()
+    async with _transaction() as db:
+        async with db.execute(f"""
+            SELECT job_id FROM recap_jobs
+            WHERE guild_id = ? AND status IN ({", ".join("?" * len(RECAP_JOB_ACTIVE))})
+            ORDER BY job_id LIMIT 1
+        """, (str(guild_id), *RECAP_JOB_ACTIVE)) as cursor:
+            row = await cursor.fetchone()
+        if row:
+            return row[0], False
+        cursor = await db.execute("""
+            INSERT INTO recap_jobs (guild_id, channel_id, status, created_at, updated_at)
+            VALUES (?, ?, 'queued', ?, ?)
+        """, (str(guild_id), str(channel_id), now, now))
+        return cursor.lastrowid, True
+
+@SQLITE_SECONDS.timed(op="claim_recap_job")
+async def claim_recap_job(worker, lease_seconds, max_attempts) -> tuple[dict, str] | None:
+    """
+    Lease the next queued job (or one whose worker's lease lapsed) to `worker`.
+    Returns (job, claim_token); the token is needed to renew, finish or fail it.
+    """
+    now = time.time()
+    token = f"{worker}:{uuid.uuid4().hex}"
+    async with _transaction() as db:
+        # Jobs that keep killing their workers stop being retried
+        await db.execute("""
+            UPDATE recap_jobs SET status = 'errored', error = 'worker lost', updated_at = ?
+            WHERE status = 'running' AND lease_until < ? AND attempts >= ?
+        """, (now, now, int(max_attempts)))
+        # One UPDATE picks and takes the row, so concurrent workers (any process) can't share it
+        await db.execute("""
+            UPDATE recap_jobs
+            SET status = 'running', claim_token = ?, lease_until = ?, started_at = ?,
+                attempts = attempts + 1, updated_at = ?
+            WHERE job_id = (
+                SELECT job_id FROM recap_jobs
+                WHERE status = 'queued' OR (status = 'running' AND lease_until < ?)
+                ORDER BY job_id LIMIT 1
+            )
+        """, (token, now + lease_seconds, now, now, now))
+        async with db.execute(
+            f"SELECT {_RECAP_JOB_COLUMNS} FROM recap_jobs WHERE claim_token = ?", (token,)
+        ) as cursor:
+            row = await cursor.fetchone()
+    return (_row_to_recap_job(row), token) if row else None
+
+@SQLITE_SECONDS.timed(op="renew_recap_job")
+async def renew_recap_job(job_id, token, lease_seconds) -> bool:
+    """Extend a lease; False if the job was reclaimed by someone else."""
+    async with _transaction() as db:
+        cursor = await db.execute("""
+            UPDATE recap_jobs SET lease_until = ?
+            WHERE job_id = ? AND claim_token = ? AND status = 'running'
+        """, (time.time() + lease_seconds, int(job_id), token))
+        return cursor.rowcount == 1
+
+@SQLITE_SECONDS.timed(op="finish_recap_job")
+async def finish_recap_job(job_id, token, league_id, season, week, last_week, payload) -> bool:
+    """Store a built page (serialized embeds) for the gateway to send."""
+    async with _transaction() as db:
+        cursor = await db.execute("""
+            UPDATE recap_jobs
+            SET status = 'built', league_id = ?, season = ?, week = ?, last_week = ?, payload = ?,
+                updated_at = ?
+            WHERE job_id = ? AND claim_token = ? AND status = 'running'
+        """, (str(league_id), str(season), int(week), int(last_week), payload, time.time(), int(job_id), token))
+        return cursor.rowcount == 1
+
+@SQLITE_SECONDS.timed(op="fail_recap_job")
+async def fail_recap_job(job_id, token, error, retry=False, count_attempt=True) -> bool:
+    """
+    Give a claimed job back to the queue (retry) or mark it errored for the
+    gateway to report. count_attempt=False hands it back without using up an
+    attempt (worker shutting down).
+    """
+    async with _transaction() as db:
+        cursor = await db.execute("""
+            UPDATE recap_jobs
+            SET status = ?, error = ?, claim_token = NULL, lease_until = NULL,
+                attempts = attempts - ?, updated_at = ?
+            WHERE job_id = ? AND claim_token = ? AND status = 'running'
+        """, ("queued" if retry else "errored", str(error), 0 if count_attempt else 1,
+              time.time(), int(job_id), token))
+        return cursor.rowcount == 1
+
+@SQLITE_SECONDS.timed(op="get_finished_recap_jobs")
+async def get_finished_recap_jobs(guild_filter=None, limit=50) -> list[dict]:
+    """
+    Built or errored jobs waiting for their gateway, oldest first. guild_filter
+    (guild_id -> bool) is applied before the limit, so rows left for another,
+    stalled shard process can't crowd out this one's.
+    """
+    db = await get_db()
+    jobs, after = [], 0
+    while len(jobs) < limit:
+        async with db.execute(f"""
+            SELECT {_RECAP_JOB_COLUMNS} FROM recap_jobs
+            WHERE status IN ('built', 'errored') AND job_id > ?
+            ORDER BY job_id LIMIT ?
+        """, (after, int(limit))) as cursor:
+            rows = await cursor.fetchall()
+        for row in rows:
+            job = _row_to_recap_job(row)
+            if guild_filter is None or guild_filter(int(job["guild_id"])):
+                jobs.append(job)
+        if len(rows) < limit:
+            break
+        after = rows[-1][0]
+    return jobs[:limit]
+
+@SQLITE_SECONDS.timed(op="close_recap_job")
+async def close_recap_job(job_id, status, error=None):
+    """Final state after the gateway sent (posted) or reported (failed) a job; drops the payload."""
+    async with _transaction() as db:
+        await db.execute("""
+            UPDATE recap_jobs SET status = ?, error = COALESCE(?, error), payload = NULL, updated_at = ?
+            WHERE job_id = ?
+        """, (status, error, time.time(), int(job_id)))
+
+@SQLITE_SECONDS.timed(op="recap_job_stats")
+async def recap_job_position(job_id) -> int:
+    """1-based position of a queued job (0 once a worker has it)."""
+    db = await get_db()
+    async with db.execute("""
+        SELECT COUNT(*) FROM recap_jobs AS q, recap_jobs AS j
+        WHERE j.job_id = ? AND j.status = 'queued' AND q.status = 'queued'
+          AND q.job_id <= j.job_id
+    """, (int(job_id),)) as cursor:
+        return (await cursor.fetchone())[0]
+
+@SQLITE_SECONDS.timed(op="recap_job_stats")
+async def count_recap_jobs() -> dict[str, int]:
+    """{status: count} over unfinished jobs."""
+    db = await get_db()
+    async with db.execute(f"""
+        SELECT status, COUNT(*) FROM recap_jobs
+        WHERE status IN ({", ".join("?" * len(RECAP_JOB_ACTIVE))})
+        GROUP BY status
+    """, RECAP_JOB_ACTIVE) as cursor:
+        rows = await cursor.fetchall()
+    return {status: 0 for status in RECAP_JOB_ACTIVE} | dict(rows)
+
+@SQLITE_SECONDS.timed(op="prune_recap_jobs")
+async def prune_recap_jobs(max_age_seconds) -> int:
+    async with _transaction() as db:
+        cursor = await db.execute("""
+            DELETE FROM recap_jobs WHERE status IN ('posted', 'failed') AND updated_at < ?
+        """, (time.time() - max_age_seconds,))
+        return cursor.rowcount
+
+@SQLITE_SECONDS.timed(op="prune_navigators")
+async def prune_navigators(max_age_seconds) -> int:
+    """Forget navigators of old recap messages; their buttons then say the recap expired."""
+    async with _transaction() as db:
+        cursor = await db.execute(
+            "DELETE FROM recap_navigators WHERE created_at < ?", (time.time() - max_age_seconds,)
+        )
+        return cursor.rowcount
+
+# ---------- Week navigators ----------
+@SQLITE_SECONDS.timed(op="save_navigator")
+async def save_navigator(message_id, guild_id, league_id, season, last_week):
+    async with _transaction() as db:
+        await db.execute("""
+            INSERT OR REPLACE INTO recap_navigators (message_id, guild_id, league_id, season, last_week, created_at)
+            VALUES (?, ?, ?, ?, ?, ?)
+        """, (str(message_id), str(guild_id), str(league_id), str(season), int(last_week), time.time()))
+
+@SQLITE_SECONDS.timed(op="get_navigator")
+async def get_navigator(message_id) -> dict | None:
+    """Navigator state for a posted recap message, or None if it was never recorded."""
+    db = await get_db()
+    async with db.execute("""
+        SELECT guild_id, league_id, season, last_week FROM recap_navigators WHERE message_id = ?
+    """, (str(message_id),)) as cursor:
+        row = await cursor.fetchone()
+    if row is None:
+        return None
+    return {"guild_id": row[0], "league_id": row[1], "season": row[2], "last_week": row[3]}
 
 def get_discord_bot_token():
     return os.environ.get("DISCORD_TOKEN")